@@ -0,0 +1,75 @@
+from typing import Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core import GUILD_CONFIGS
+
+class Admin(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    @app_commands.command(name="config", description="⚙️ View or change this server's bot settings (Admin only)")
+    @app_commands.describe(
+        welcome_channel="Where new members are welcomed",
+        admin_log_channel="Where moderation events are logged",
+        ticket_log_channel="Where ticket events are logged",
+        trainee_role="Role given to new members",
+        admin_role="Add or remove a role with admin access to the bot",
+        mod_role="Add or remove a role exempt from spam checks",
+        gambling="Allow /coinflip, /dice and /jackpot"
+    )
+    @app_commands.guild_only()
+    async def configure(
+        self,
+        interaction: discord.Interaction,
+        welcome_channel: Optional[discord.TextChannel] = None,
+        admin_log_channel: Optional[discord.TextChannel] = None,
+        ticket_log_channel: Optional[discord.TextChannel] = None,
+        trainee_role: Optional[discord.Role] = None,
+        admin_role: Optional[discord.Role] = None,
+        mod_role: Optional[discord.Role] = None,
+        gambling: Optional[bool] = None
+    ):
+        config = GUILD_CONFIGS.get(interaction.guild_id)
+        if not (interaction.user.guild_permissions.manage_guild or config.is_admin(interaction.user)):
+            embed = discord.Embed(
+                title="❌ Permission Denied",
+                description="You need the Manage Server permission or an admin role to change settings",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        for key, target in (
+            ("welcome_channel_id", welcome_channel),
+            ("admin_log_channel_id", admin_log_channel),
+            ("ticket_log_channel_id", ticket_log_channel),
+            ("trainee_role_id", trainee_role)
+        ):
+            if target:
+                config.set(key, target.id)
+        for key, role in (("admin_role_ids", admin_role), ("mod_role_ids", mod_role)):
+            if role:
+                role_ids = set(config.settings[key]) ^ {role.id}
+                config.set(key, sorted(role_ids))
+        if gambling is not None:
+            config.set("gambling_enabled", gambling)
+        
+        def mention(item) -> str:
+            return item.mention if item else "Not set"
+        
+        guild = interaction.guild
+        embed = discord.Embed(title=f"⚙️ Settings for {guild.name}", color=discord.Color.blurple())
+        embed.add_field(name="👋 Welcome Channel", value=mention(config.welcome_channel()), inline=True)
+        embed.add_field(name="🛡️ Admin Log", value=mention(config.admin_log_channel()), inline=True)
+        embed.add_field(name="🎫 Ticket Log", value=mention(config.ticket_log_channel()), inline=True)
+        embed.add_field(name="👶 Trainee Role", value=mention(config.trainee_role()), inline=True)
+        embed.add_field(name="👑 Admin Roles", value=" ".join(f"<@&{role_id}>" for role_id in sorted(config.admin_role_ids)) or "None", inline=True)
+        embed.add_field(name="🔨 Mod Roles", value=" ".join(f"<@&{role_id}>" for role_id in sorted(config.mod_role_ids)) or "None", inline=True)
+        embed.add_field(name="🎰 Gambling", value="Enabled" if config.settings["gambling_enabled"] else "Disabled", inline=True)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Admin(bot))
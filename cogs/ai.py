@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core import bot, db, format_amount, get_user_stats, start_when_ready, throttle
+from state.ai import AI_BASE_COST, AI_MAX_COST, AI_SERVICE, AI_THREAD_EXPIRY, AI_THREAD_LIFETIME, AIError
+
+def ai_cost(question: str) -> int:
+    return min(AI_MAX_COST, AI_BASE_COST + len(question) // 200)
+
+async def expire_ai_thread(thread_id: int, when: datetime):
+    with db:
+        db.execute("DELETE FROM ai_threads WHERE thread_id = ?", (thread_id,))
+    thread = bot.get_channel(thread_id)
+    if thread is None:
+        try:
+            thread = await bot.fetch_channel(thread_id)
+        except discord.HTTPException:
+            return
+    try:
+        await thread.delete()
+    except discord.HTTPException:
+        pass
+
+class ObizAI(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    async def cog_load(self):
+        AI_THREAD_EXPIRY.callback = expire_ai_thread
+        start_when_ready(AI_SERVICE.start, AI_THREAD_EXPIRY.start)
+    
+    async def cog_unload(self):
+        AI_THREAD_EXPIRY.stop()
+        await AI_SERVICE.close()
+    
+    @app_commands.command(name="askai", description="🤖 Ask Obiz AI a question (10-15 Obiz Coins)")
+    @app_commands.describe(question="What would you like to ask?")
+    async def askai(self, interaction: discord.Interaction, question: app_commands.Range[str, 1, 1500]):
+        if not await throttle(interaction, "askai"):
+            return
+        
+        user_id = str(interaction.user.id)
+        stats = get_user_stats(user_id)
+        cost = ai_cost(question)
+        if stats["coins"] < cost:
+            embed = discord.Embed(
+                title="❌ Insufficient Funds",
+                description=f"Obiz AI costs 🪙 {cost} for this question, but you only have 🪙 {format_amount(stats['coins'])}",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Hold the coins while the question is answered; they come back if it fails
+        stats["coins"] -= cost
+        try:
+            await interaction.response.defer(thinking=True)
+        except discord.HTTPException:
+            stats["coins"] += cost
+            return
+        
+        try:
+            answer = await AI_SERVICE.ask(question)
+        except AIError as e:
+            stats["coins"] += cost
+            embed = discord.Embed(
+                title="❌ Obiz AI Unavailable",
+                description=f"{e}. Your 🪙 {cost} have been refunded.",
+                color=discord.Color.red()
+            )
+            await interaction.followup.send(embed=embed)
+            return
+        
+        question_embed = discord.Embed(
+            title="🤖 Obiz AI",
+            description=f"**{interaction.user.display_name} asked:** {question[:1000]}",
+            color=discord.Color.purple()
+        )
+        question_embed.set_footer(text=f"Cost: 🪙 {cost} • Balance: 🪙 {format_amount(stats['coins'])}")
+        answer_embed = discord.Embed(description=answer[:4096], color=discord.Color.purple())
+        
+        if not isinstance(interaction.channel, discord.TextChannel):
+            await interaction.followup.send(embeds=[question_embed, answer_embed])
+            return
+        
+        question_embed.set_footer(text=f"Cost: 🪙 {cost} • This thread is deleted after {int(AI_THREAD_LIFETIME.total_seconds() // 60)} minutes")
+        message = await interaction.followup.send(embed=question_embed, wait=True)
+        try:
+            thread = await message.create_thread(name=f"🤖 {question[:90]}", auto_archive_duration=60)
+            await thread.send(embed=answer_embed)
+        except discord.HTTPException:
+            question_embed.set_footer(text=f"Cost: 🪙 {cost} • Balance: 🪙 {format_amount(stats['coins'])}")
+            await message.edit(embeds=[question_embed, answer_embed])
+            return
+        
+        expires_at = datetime.now() + AI_THREAD_LIFETIME
+        with db:
+            db.execute("INSERT OR REPLACE INTO ai_threads (thread_id, expires_at) VALUES (?, ?)", (thread.id, expires_at.isoformat()))
+        AI_THREAD_EXPIRY.schedule(thread.id, expires_at)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ObizAI(bot))
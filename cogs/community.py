@@ -0,0 +1,109 @@
+import itertools
+from datetime import datetime
+from typing import List
+
+import discord
+import pytz
+from discord import app_commands
+from discord.ext import commands
+
+from core import bot, db, start_when_ready
+from state.community import (
+    GREETING_BUCKETS, GREETING_MAX_MENTIONS, GREETING_SCHEDULE, GREETINGS, JOIN_PIPELINE,
+    join_greeting_bucket, leave_greeting_bucket, next_greeting_time, next_quote
+)
+
+async def send_greeting(key: tuple, when: datetime):
+    """Greet everyone in one timezone bucket, one message per channel"""
+    zone, greeting = key
+    channels = GREETING_BUCKETS.get(zone)
+    if not channels:
+        return
+    GREETING_SCHEDULE.schedule(key, next_greeting_time(zone, GREETINGS[greeting]))
+    
+    for channel_id, user_ids in channels.items():
+        channel = bot.get_channel(channel_id)
+        if not channel:
+            continue
+        
+        names = " ".join(f"<@{user_id}>" for user_id in itertools.islice(user_ids, GREETING_MAX_MENTIONS))
+        if len(user_ids) > GREETING_MAX_MENTIONS:
+            names += f" and {len(user_ids) - GREETING_MAX_MENTIONS} more"
+        embed = discord.Embed(
+            title=f"{greeting}!",
+            description=f"{next_quote(channel.guild.id)}\n\n{names}",
+            color=discord.Color.gold()
+        )
+        embed.set_footer(text=f"🕒 {zone}")
+        try:
+            await channel.send(embed=embed, allowed_mentions=discord.AllowedMentions.none())
+        except discord.HTTPException:
+            pass
+
+async def timezone_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    matches = [zone for zone in pytz.common_timezones if current.lower() in zone.lower()]
+    return [app_commands.Choice(name=zone, value=zone) for zone in matches[:25]]
+
+class Community(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    async def cog_load(self):
+        GREETING_SCHEDULE.callback = send_greeting
+        start_when_ready(JOIN_PIPELINE.start, GREETING_SCHEDULE.start)
+    
+    async def cog_unload(self):
+        GREETING_SCHEDULE.stop()
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if member.bot:
+            return
+        
+        # Stats are created on first use; the role, DM and announcement are batched
+        JOIN_PIPELINE.add(member)
+    
+    @app_commands.command(name="timezone", description="🕒 Get daily greetings in your timezone")
+    @app_commands.describe(zone="Your timezone, e.g. Asia/Kolkata, or 'off' to stop greetings")
+    @app_commands.autocomplete(zone=timezone_autocomplete)
+    async def set_timezone(self, interaction: discord.Interaction, zone: str):
+        user_id = str(interaction.user.id)
+        
+        if zone.lower() == "off":
+            leave_greeting_bucket(user_id)
+            with db:
+                db.execute("DELETE FROM user_timezones WHERE user_id = ?", (user_id,))
+            embed = discord.Embed(
+                description="🔕 You won't receive daily greetings anymore",
+                color=discord.Color.blurple()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if zone not in pytz.all_timezones_set:
+            embed = discord.Embed(
+                title="❌ Unknown Timezone",
+                description=f"`{zone}` isn't a timezone I know. Try one from the suggestions, like `Europe/London`.",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        join_greeting_bucket(user_id, zone, interaction.channel_id)
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO user_timezones (user_id, timezone, channel_id) VALUES (?, ?, ?)",
+                (user_id, zone, interaction.channel_id)
+            )
+        
+        local_time = datetime.now(pytz.timezone(zone))
+        embed = discord.Embed(
+            title="🕒 Timezone Set!",
+            description=f"It's {local_time.strftime('%H:%M')} for you in **{zone}**.\n"
+                        f"You'll be greeted in this channel every morning, evening and night.",
+            color=discord.Color.green()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Community(bot))
@@ -0,0 +1,485 @@
+import random
+from datetime import datetime, timedelta
+
+import discord
+from discord import app_commands, ui
+from discord.ext import commands
+
+from core import (
+    BADGES, INVENTORY, SHOP_ITEMS, USER_STATS, award, db, format_amount, throttle
+)
+from state.tickets import TICKETS_DB
+from state.work_hours import WORK_HOURS, voice_seconds
+
+class ShopView(ui.View):
+    def __init__(self):
+        super().__init__(timeout=180)
+        
+    @ui.select(
+        placeholder="🛍️ Select an item to purchase...",
+        options=[
+            discord.SelectOption(
+                label=f"{item} - 🪙 {details['price']}",
+                description=details["description"],
+                value=item
+            ) for item, details in SHOP_ITEMS.items()
+        ],
+        min_values=1,
+        max_values=1
+    )
+    async def shop_select(self, interaction: discord.Interaction, select: ui.Select):
+        item = select.values[0]
+        user_id = str(interaction.user.id)
+        
+        if user_id not in USER_STATS:
+            USER_STATS[user_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        
+        if USER_STATS[user_id]["coins"] < SHOP_ITEMS[item]["price"]:
+            embed = discord.Embed(
+                title="❌ Insufficient Funds",
+                description=f"You need 🪙 {format_amount(SHOP_ITEMS[item]['price'] - USER_STATS[user_id]['coins'])} more coins to buy {item}",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Process purchase
+        USER_STATS[user_id]["coins"] -= SHOP_ITEMS[item]["price"]
+        expires_at = INVENTORY.add(user_id, item)
+        
+        if item == "Custom Role":
+            # Prompt for role details
+            await interaction.response.send_modal(CustomRoleModal())
+        else:
+            embed = discord.Embed(
+                title="🎉 Purchase Successful!",
+                description=f"You've purchased: **{item}**",
+                color=discord.Color.green()
+            )
+            embed.add_field(name="Description", value=SHOP_ITEMS[item]["description"], inline=False)
+            if expires_at:
+                embed.add_field(name="Active Until", value=discord.utils.format_dt(expires_at, "f"), inline=False)
+            embed.add_field(name="Remaining Balance", value=f"🪙 {format_amount(USER_STATS[user_id]['coins'])}", inline=False)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+class CustomRoleModal(ui.Modal, title="🎨 Create Custom Role"):
+    role_name = ui.TextInput(
+        label="Role Name",
+        placeholder="Enter your desired role name",
+        style=discord.TextStyle.short,
+        max_length=100
+    )
+    
+    role_color = ui.TextInput(
+        label="Role Color (hex code)",
+        placeholder="e.g., #FF0000 for red",
+        style=discord.TextStyle.short,
+        max_length=7
+    )
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            # Validate color
+            color = discord.Color.from_str(str(self.role_color))
+            
+            # Create the role
+            role = await interaction.guild.create_role(
+                name=str(self.role_name),
+                color=color,
+                reason=f"Custom role purchased by {interaction.user}"
+            )
+            
+            # Assign the role to the user
+            await interaction.user.add_roles(role)
+            
+            embed = discord.Embed(
+                title="🎉 Custom Role Created!",
+                description=f"Your new role **{role.name}** has been created and assigned to you!",
+                color=color
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        except ValueError:
+            embed = discord.Embed(
+                title="❌ Invalid Color",
+                description="Please provide a valid hex color code (e.g., #FF0000)",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+class Economy(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    @app_commands.command(name="balance", description="💰 Check your Obiz Coin balance")
+    async def check_balance(self, interaction: discord.Interaction):
+        user_id = str(interaction.user.id)
+        if user_id not in USER_STATS:
+            USER_STATS[user_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        
+        embed = discord.Embed(
+            title=f"💰 {interaction.user.display_name}'s Balance",
+            color=discord.Color.gold()
+        )
+        embed.add_field(name="🪙 Obiz Coins", value=f"{format_amount(USER_STATS[user_id]['coins'])}", inline=True)
+        embed.add_field(name="📊 Level", value=f"{USER_STATS[user_id]['level']}", inline=True)
+        embed.add_field(name="✨ XP", value=f"{format_amount(USER_STATS[user_id]['xp'])}/{USER_STATS[user_id]['level'] * 100}", inline=True)
+        
+        if USER_STATS[user_id]["badges"]:
+            badges = " ".join([BADGES.get(b, "") for b in USER_STATS[user_id]["badges"]])
+            embed.add_field(name="🏆 Badges", value=badges, inline=False)
+        
+        embed.set_thumbnail(url=interaction.user.avatar.url)
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="daily", description="🎁 Claim your daily Obiz Coin reward")
+    async def daily_reward(self, interaction: discord.Interaction):
+        if not await throttle(interaction, "daily"):
+            return
+        
+        user_id = str(interaction.user.id)
+        if user_id not in USER_STATS:
+            USER_STATS[user_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        
+        now = datetime.now()
+        last_daily = USER_STATS[user_id]["last_daily"]
+        
+        if last_daily and (now - last_daily).days < 1:
+            next_claim = (last_daily + timedelta(days=1)).strftime("%H:%M %p")
+            embed = discord.Embed(
+                title="⏳ Already Claimed",
+                description=f"You've already claimed your daily reward today!\nNext claim available at {next_claim}",
+                color=discord.Color.orange()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Calculate streak
+        if last_daily and (now - last_daily).days == 1:
+            USER_STATS[user_id]["streak"] += 1
+        else:
+            USER_STATS[user_id]["streak"] = 1
+        
+        # Calculate reward (50-150 coins + streak bonus)
+        base_reward = random.randint(50, 150)
+        streak_bonus = min(USER_STATS[user_id]["streak"] * 10, 100)  # Max 100 bonus
+        reward = award(user_id, coins=base_reward + streak_bonus)
+        total_reward = reward["coins"]
+        USER_STATS[user_id]["last_daily"] = now
+        
+        embed = discord.Embed(
+            title="🎁 Daily Reward Claimed!",
+            description=f"Here's your daily Obiz Coin reward!",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Base Reward", value=f"🪙 {base_reward}", inline=True)
+        embed.add_field(name="Streak Bonus", value=f"🔥 +{streak_bonus}", inline=True)
+        if reward["multiplier"] > 1:
+            embed.add_field(name="Bonus", value=f"🎉 {reward['multiplier']:g}x Multiplier!", inline=True)
+        embed.add_field(name="Total Received", value=f"🪙 {format_amount(total_reward)}", inline=False)
+        embed.add_field(name="Current Streak", value=f"🔥 {USER_STATS[user_id]['streak']} days", inline=False)
+        embed.add_field(name="New Balance", value=f"💰 {format_amount(USER_STATS[user_id]['coins'])}", inline=False)
+        embed.set_footer(text="Come back tomorrow for more!")
+        
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="shop", description="🛍️ Spend your Obiz Coins in the shop")
+    async def shop(self, interaction: discord.Interaction):
+        embed = discord.Embed(
+            title="🛍️ Obiz Coin Shop",
+            description="Spend your hard-earned Obiz Coins on awesome perks!",
+            color=discord.Color.purple()
+        )
+        
+        for item, details in SHOP_ITEMS.items():
+            embed.add_field(
+                name=f"{item} - 🪙 {details['price']}",
+                value=details["description"],
+                inline=False
+            )
+        
+        user_id = str(interaction.user.id)
+        if user_id in USER_STATS:
+            embed.set_footer(text=f"Your balance: 🪙 {format_amount(USER_STATS[user_id]['coins'])}")
+        else:
+            embed.set_footer(text="New users start with 🪙 1000")
+        
+        await interaction.response.send_message(embed=embed, view=ShopView())
+    
+    @app_commands.command(name="transfer", description="💸 Transfer Obiz Coins to another user")
+    async def transfer_coins(self, interaction: discord.Interaction, recipient: discord.Member, amount: int):
+        if not await throttle(interaction, "transfer"):
+            return
+        
+        sender_id = str(interaction.user.id)
+        recipient_id = str(recipient.id)
+        
+        if sender_id == recipient_id:
+            embed = discord.Embed(
+                title="❌ Invalid Transfer",
+                description="You can't send coins to yourself!",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if amount <= 0:
+            embed = discord.Embed(
+                title="❌ Invalid Amount",
+                description="You must transfer at least 🪙 1",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Initialize sender and recipient if needed
+        if sender_id not in USER_STATS:
+            USER_STATS[sender_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        if recipient_id not in USER_STATS:
+            USER_STATS[recipient_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        
+        if USER_STATS[sender_id]["coins"] < amount:
+            embed = discord.Embed(
+                title="❌ Insufficient Funds",
+                description=f"You only have 🪙 {format_amount(USER_STATS[sender_id]['coins'])}",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Perform transfer
+        USER_STATS[sender_id]["coins"] -= amount
+        USER_STATS[recipient_id]["coins"] += amount
+        
+        embed = discord.Embed(
+            title="💸 Transfer Complete!",
+            description=f"You've sent 🪙 {amount} to {recipient.mention}",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Your New Balance", value=f"🪙 {format_amount(USER_STATS[sender_id]['coins'])}", inline=False)
+        await interaction.response.send_message(embed=embed)
+        
+        try:
+            recipient_embed = discord.Embed(
+                title="🎉 You Received Obiz Coins!",
+                description=f"{interaction.user.mention} sent you 🪙 {amount}",
+                color=discord.Color.green()
+            )
+            recipient_embed.add_field(name="Your New Balance", value=f"🪙 {format_amount(USER_STATS[recipient_id]['coins'])}", inline=False)
+            await recipient.send(embed=recipient_embed)
+        except discord.Forbidden:
+            pass
+    
+    @app_commands.command(name="profile", description="📊 View your profile and stats")
+    async def profile(self, interaction: discord.Interaction):
+        user_id = str(interaction.user.id)
+        if user_id not in USER_STATS:
+            USER_STATS[user_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        
+        # Calculate stats
+        tickets_created = len([t for t in TICKETS_DB.values() if t.creator.id == interaction.user.id])
+        tickets_completed = len([t for t in TICKETS_DB.values() if t.assignee.id == interaction.user.id and t.status == "Completed"])
+        total_hours = sum(day["hours"] for day in WORK_HOURS.get(user_id, {}).values())
+        
+        embed = discord.Embed(
+            title=f"📊 {interaction.user.display_name}'s Profile",
+            color=discord.Color.blue()
+        )
+        embed.set_thumbnail(url=interaction.user.avatar.url)
+        
+        # Basic info
+        embed.add_field(name="🪙 Obiz Coins", value=f"{format_amount(USER_STATS[user_id]['coins'])}", inline=True)
+        embed.add_field(name="📊 Level", value=f"{USER_STATS[user_id]['level']}", inline=True)
+        embed.add_field(name="✨ XP", value=f"{format_amount(USER_STATS[user_id]['xp'])}/{USER_STATS[user_id]['level'] * 100}", inline=True)
+        
+        # Stats
+        embed.add_field(name="🎟️ Tickets Created", value=tickets_created, inline=True)
+        embed.add_field(name="✅ Tickets Completed", value=tickets_completed, inline=True)
+        embed.add_field(name="⏱️ Hours Worked", value=f"{total_hours:.1f}", inline=True)
+        embed.add_field(name="🎙️ Voice Hours", value=f"{voice_seconds(user_id) / 3600:.1f}", inline=True)
+        
+        # Badges
+        if USER_STATS[user_id]["badges"]:
+            badges = " ".join([BADGES.get(b, "") for b in USER_STATS[user_id]["badges"]])
+            embed.add_field(name="🏆 Badges", value=badges, inline=False)
+        
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="leaderboard", description="🏆 View leaderboards")
+    async def leaderboard(self, interaction: discord.Interaction, metric: str = "coins"):
+        if metric.lower() not in ["coins", "level", "tickets", "hours", "voice"]:
+            embed = discord.Embed(
+                title="❌ Invalid Metric",
+                description="Available metrics: coins, level, tickets, hours, voice",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Prepare leaderboard data
+        leaderboard_data = []
+        if metric == "voice":
+            # Running totals are indexed by time, so read them best-first
+            for user_id, seconds in db.execute("SELECT user_id, seconds FROM voice_totals ORDER BY seconds DESC LIMIT 200"):
+                user = interaction.guild.get_member(int(user_id))
+                if user:
+                    leaderboard_data.append((user.display_name, round(voice_seconds(user_id) / 3600, 1)))
+        else:
+            for user_id, stats in USER_STATS.items():
+                user = interaction.guild.get_member(int(user_id))
+                if not user:
+                    continue
+                
+                if metric == "coins":
+                    value = stats["coins"]
+                elif metric == "level":
+                    value = stats["level"]
+                elif metric == "tickets":
+                    value = len([t for t in TICKETS_DB.values() if t.assignee.id == user.id and t.status == "Completed"])
+                elif metric == "hours":
+                    value = sum(day["hours"] for day in WORK_HOURS.get(user_id, {}).values())
+                
+                leaderboard_data.append((user.display_name, value))
+        
+        # Sort and limit to top 10
+        leaderboard_data.sort(key=lambda x: x[1], reverse=True)
+        leaderboard_data = leaderboard_data[:10]
+        
+        if not leaderboard_data:
+            embed = discord.Embed(
+                title="🏆 Leaderboard",
+                description="No data available yet!",
+                color=discord.Color.blue()
+            )
+            await interaction.response.send_message(embed=embed)
+            return
+        
+        embed = discord.Embed(
+            title=f"🏆 {metric.capitalize()} Leaderboard",
+            color=discord.Color.gold()
+        )
+        
+        for i, (name, value) in enumerate(leaderboard_data, 1):
+            embed.add_field(
+                name=f"{i}. {name}",
+                value=f"{format_amount(value) if metric == 'coins' else value} {'🪙' if metric == 'coins' else '📊' if metric == 'level' else '✅' if metric == 'tickets' else '⏱️'}",
+                inline=False
+            )
+        
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="freelance", description="💼 Browse available freelance tasks")
+    async def freelance(self, interaction: discord.Interaction):
+        # Get open tickets not assigned to anyone
+        freelance_tasks = [t for t in TICKETS_DB.values() if t.status == "Open" and t.assignee is None]
+        
+        if not freelance_tasks:
+            embed = discord.Embed(
+                title="💼 Freelance Tasks",
+                description="No available tasks at the moment. Check back later!",
+                color=discord.Color.blue()
+            )
+            await interaction.response.send_message(embed=embed)
+            return
+        
+        embed = discord.Embed(
+            title="💼 Available Freelance Tasks",
+            description="Claim one of these tasks to earn Obiz Coins!",
+            color=discord.Color.green()
+        )
+        
+        for task in freelance_tasks[:5]:
+            embed.add_field(
+                name=f"🎟️ #{task.id} - {task.title}",
+                value=f"**Reward:** 🪙 {100 * (1 + ['Low', 'Medium', 'High', 'Critical'].index(task.priority))}\n**Deadline:** {task.deadline}",
+                inline=False
+            )
+        
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="refer", description="📨 Refer a friend and earn Obiz Coins")
+    async def refer_friend(self, interaction: discord.Interaction, friend: discord.Member):
+        if friend.bot:
+            embed = discord.Embed(
+                title="❌ Invalid Referral",
+                description="You can't refer bots!",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if friend.id == interaction.user.id:
+            embed = discord.Embed(
+                title="❌ Invalid Referral",
+                description="You can't refer yourself!",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        user_id = str(interaction.user.id)
+        if user_id not in USER_STATS:
+            USER_STATS[user_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        
+        # Check if friend is new (has no coins yet)
+        friend_id = str(friend.id)
+        if friend_id in USER_STATS and USER_STATS[friend_id]["coins"] < 1000:
+            embed = discord.Embed(
+                title="❌ Already Referred",
+                description="This user has already been referred by someone else",
+                color=discord.Color.orange()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Award coins
+        reward = award(user_id, coins=300)
+        
+        embed = discord.Embed(
+            title="🎉 Referral Successful!",
+            description=f"You've referred {friend.mention} and earned 🪙 {format_amount(reward['coins'])}!",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Your New Balance", value=f"🪙 {format_amount(USER_STATS[user_id]['coins'])}", inline=False)
+        await interaction.response.send_message(embed=embed)
+        
+        try:
+            # Initialize friend's account
+            if friend_id not in USER_STATS:
+                USER_STATS[friend_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+            
+            friend_embed = discord.Embed(
+                title="🎉 You've Been Referred!",
+                description=f"{interaction.user.mention} referred you to the server!",
+                color=discord.Color.green()
+            )
+            friend_embed.add_field(name="Welcome Bonus", value="You've received 🪙 1000 to get started!", inline=False)
+            await friend.send(embed=friend_embed)
+        except discord.Forbidden:
+            pass
+    
+    # Inventory
+    @app_commands.command(name="inventory", description="🎒 View your items and active buffs")
+    async def inventory(self, interaction: discord.Interaction):
+        user_id = str(interaction.user.id)
+        held = INVENTORY.held(user_id)
+        embed = discord.Embed(
+            title=f"🎒 {interaction.user.display_name}'s Inventory",
+            color=discord.Color.blurple()
+        )
+        
+        if held:
+            embed.description = "\n".join(
+                f"• **{item}**" + (f" - expires {discord.utils.format_dt(expires_at, 'R')}" if expires_at else "")
+                for item, expires_at in held.items()
+            )
+        else:
+            embed.description = "You don't own any items yet. Visit the `/shop`!"
+        
+        multipliers = INVENTORY.multipliers(user_id)
+        embed.add_field(name="🪙 Coins", value=f"{multipliers['coins']:g}x", inline=True)
+        embed.add_field(name="✨ XP", value=f"{multipliers['xp']:g}x", inline=True)
+        embed.add_field(name="🐾 Pet XP", value=f"{multipliers['pet_xp']:g}x", inline=True)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Economy(bot))
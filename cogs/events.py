@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core import is_admin, set_event
+
+class Events(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    @app_commands.command(name="event", description="🎪 Start a special event (Admin only)")
+    @app_commands.describe(event_type="Type of event to start")
+    @app_commands.choices(event_type=[
+        app_commands.Choice(name="Double Coins", value="Double Coins"),
+        app_commands.Choice(name="Hackathon", value="Hackathon"),
+        app_commands.Choice(name="Ticket Blitz", value="Ticket Blitz")
+    ])
+    async def start_event(self, interaction: discord.Interaction, event_type: app_commands.Choice[str]):
+        # Check admin permissions
+        if not is_admin(interaction.user):
+            embed = discord.Embed(
+                title="❌ Permission Denied",
+                description="You need admin privileges to start events",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        set_event({
+            "type": event_type.value,
+            "start_time": datetime.now(),
+            "end_time": datetime.now() + timedelta(hours=24)
+        })
+        
+        embed = discord.Embed(
+            title="🎉 Event Started!",
+            description=f"A **{event_type.value}** event has begun!",
+            color=discord.Color.purple()
+        )
+        
+        if event_type.value == "Double Coins":
+            embed.add_field(name="Effect", value="Earn double Obiz Coins for all activities!", inline=False)
+        elif event_type.value == "Hackathon":
+            embed.add_field(name="Effect", value="Special bonuses for completing tickets quickly!", inline=False)
+        elif event_type.value == "Ticket Blitz":
+            embed.add_field(name="Effect", value="Increased rewards for creating and completing tickets!", inline=False)
+        
+        embed.add_field(name="Duration", value="24 hours", inline=False)
+        await interaction.response.send_message(embed=embed)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Events(bot))
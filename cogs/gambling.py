@@ -0,0 +1,301 @@
+import asyncio
+import random
+
+import discord
+from discord import app_commands, ui
+from discord.ext import commands, tasks
+
+from core import (
+    USER_STATS, bot, finish_game, format_amount, send_game_in_progress, start_game,
+    start_when_ready, throttle
+)
+from state.gambling import JACKPOT_DRAW_TIME, JACKPOT_POOL
+
+class CoinFlipView(ui.View):
+    def __init__(self, amount: int, choice: str, interaction: discord.Interaction):
+        super().__init__(timeout=60)
+        self.amount = amount
+        self.choice = choice
+        self.interaction = interaction
+        self.user_id = str(interaction.user.id)
+        
+    @ui.button(label="Flip the Coin!", style=discord.ButtonStyle.blurple, emoji="🪙")
+    async def flip_coin(self, interaction: discord.Interaction, button: ui.Button):
+        if str(interaction.user.id) != self.user_id:
+            await interaction.response.send_message("This coin flip isn't yours!", ephemeral=True)
+            return
+        
+        if not start_game(self.user_id, "coin flip"):
+            await send_game_in_progress(interaction)
+            return
+        
+        try:
+            # Deduct coins first
+            if self.user_id not in USER_STATS:
+                USER_STATS[self.user_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        
+            if USER_STATS[self.user_id]["coins"] < self.amount:
+                embed = discord.Embed(
+                    title="❌ Insufficient Funds",
+                    description="You don't have enough coins for this bet!",
+                    color=discord.Color.red()
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+        
+            USER_STATS[self.user_id]["coins"] -= self.amount
+        
+            # Animate the flip
+            flip_gif = "https://media.giphy.com/media/3o7btPCcdNniyf0ArS/giphy.gif"
+            embed = discord.Embed(title="🪙 Coin Flip in Progress...", color=discord.Color.gold())
+            embed.set_image(url=flip_gif)
+            await interaction.response.edit_message(embed=embed, view=None)
+        
+            # Wait for dramatic effect
+            await asyncio.sleep(3)
+        
+            # Determine result
+            result = random.choice(["Heads", "Tails"])
+            win = result.lower() == self.choice.lower()
+        
+            # Update coins
+            if win:
+                USER_STATS[self.user_id]["coins"] += self.amount * 2
+                result_msg = f"🎉 You won 🪙 {self.amount * 2}!"
+                color = discord.Color.green()
+                gif = "https://media.giphy.com/media/xUOxfjsW9fWPqEWouI/giphy.gif"
+            else:
+                result_msg = f"😢 You lost 🪙 {self.amount}."
+                color = discord.Color.red()
+                gif = "https://media.giphy.com/media/l3V0j3ytFyGHqiV7W/giphy.gif"
+        
+            # Send result
+            embed = discord.Embed(
+                title=f"🪙 Coin Flip: {result}",
+                description=f"You chose **{self.choice}**\n{result_msg}",
+                color=color
+            )
+            embed.set_image(url=gif)
+            embed.set_footer(text=f"Current balance: 🪙 {format_amount(USER_STATS[self.user_id]['coins'])}")
+            await interaction.edit_original_response(embed=embed)
+        finally:
+            finish_game(self.user_id)
+
+class JackpotView(ui.View):
+    def __init__(self):
+        super().__init__(timeout=None)
+        
+    @ui.button(label="🎰 Join Jackpot!", style=discord.ButtonStyle.green, custom_id="jackpot_join")
+    async def join_jackpot(self, interaction: discord.Interaction, button: ui.Button):
+        if not await throttle(interaction, "jackpot"):
+            return
+        
+        user_id = str(interaction.user.id)
+        
+        if user_id not in USER_STATS:
+            USER_STATS[user_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        
+        if USER_STATS[user_id]["coins"] < 100:
+            embed = discord.Embed(
+                title="❌ Insufficient Funds",
+                description="You need at least 🪙 100 to join the jackpot!",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if user_id in JACKPOT_POOL["participants"]:
+            embed = discord.Embed(
+                title="⚠️ Already Joined",
+                description="You're already in the jackpot pool!",
+                color=discord.Color.orange()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Deduct coins and add to pool
+        USER_STATS[user_id]["coins"] -= 100
+        JACKPOT_POOL["total"] += 100
+        JACKPOT_POOL["participants"][user_id] = interaction.user.display_name
+        
+        embed = discord.Embed(
+            title="🎰 Jackpot Joined!",
+            description=f"You've entered the jackpot with 🪙 100!\nCurrent pool: 🪙 {JACKPOT_POOL['total']}",
+            color=discord.Color.green()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@tasks.loop(time=JACKPOT_DRAW_TIME)
+async def check_jackpot():
+    if JACKPOT_POOL["total"] > 0 and JACKPOT_POOL["participants"]:
+        # Select a winner
+        winner_id = random.choice(list(JACKPOT_POOL["participants"].keys()))
+        winner_name = JACKPOT_POOL["participants"][winner_id]
+        amount = JACKPOT_POOL["total"]
+        
+        # Award coins
+        if winner_id not in USER_STATS:
+            USER_STATS[winner_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        USER_STATS[winner_id]["coins"] += amount
+        
+        # Announce winner
+        embed = discord.Embed(
+            title="🎉 Jackpot Winner!",
+            description=f"**{winner_name}** has won the jackpot of 🪙 {amount}!",
+            color=discord.Color.gold()
+        )
+        embed.set_thumbnail(url="https://media.giphy.com/media/xUOxfjsW9fWPqEWouI/giphy.gif")
+        
+        for guild in bot.guilds:
+            system_channel = guild.system_channel
+            if system_channel:
+                await system_channel.send(embed=embed)
+        
+        # Reset jackpot
+        JACKPOT_POOL["total"] = 0
+        JACKPOT_POOL["participants"] = {}
+
+class Gambling(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    async def cog_load(self):
+        start_when_ready(check_jackpot.start)
+    
+    async def cog_unload(self):
+        check_jackpot.cancel()
+    
+    @app_commands.command(name="coinflip", description="🪙 Flip a coin to win Obiz Coins")
+    async def coin_flip(self, interaction: discord.Interaction, amount: int, choice: str):
+        if not await throttle(interaction, "coinflip"):
+            return
+        
+        if amount <= 0:
+            embed = discord.Embed(
+                title="❌ Invalid Bet",
+                description="You must bet at least 🪙 1",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if choice.lower() not in ["heads", "tails"]:
+            embed = discord.Embed(
+                title="❌ Invalid Choice",
+                description="Please choose either 'heads' or 'tails'",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        user_id = str(interaction.user.id)
+        if user_id not in USER_STATS:
+            USER_STATS[user_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        
+        if USER_STATS[user_id]["coins"] < amount:
+            embed = discord.Embed(
+                title="❌ Insufficient Funds",
+                description=f"You only have 🪙 {format_amount(USER_STATS[user_id]['coins'])}",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title="🪙 Coin Flip",
+            description=f"You're betting 🪙 {amount} on **{choice.capitalize()}**\nClick the button below to flip!",
+            color=discord.Color.gold()
+        )
+        embed.set_footer(text=f"Current balance: 🪙 {format_amount(USER_STATS[user_id]['coins'])}")
+        
+        view = CoinFlipView(amount, choice, interaction)
+        await interaction.response.send_message(embed=embed, view=view)
+    
+    @app_commands.command(name="dice", description="🎲 Roll a dice to win Obiz Coins")
+    async def dice_roll(self, interaction: discord.Interaction, amount: int):
+        if not await throttle(interaction, "dice"):
+            return
+        
+        if amount <= 0:
+            embed = discord.Embed(
+                title="❌ Invalid Bet",
+                description="You must bet at least 🪙 1",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        user_id = str(interaction.user.id)
+        if user_id not in USER_STATS:
+            USER_STATS[user_id] = {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+        
+        if USER_STATS[user_id]["coins"] < amount:
+            embed = discord.Embed(
+                title="❌ Insufficient Funds",
+                description=f"You only have 🪙 {format_amount(USER_STATS[user_id]['coins'])}",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if not start_game(user_id, "dice roll"):
+            await send_game_in_progress(interaction)
+            return
+        
+        try:
+            # Deduct coins first
+            USER_STATS[user_id]["coins"] -= amount
+        
+            # Animate the roll
+            roll_gif = "https://media.giphy.com/media/3o6Zt6ML6BklcajjsA/giphy.gif"
+            embed = discord.Embed(title="🎲 Rolling Dice...", color=discord.Color.gold())
+            embed.set_image(url=roll_gif)
+            await interaction.response.send_message(embed=embed)
+        
+            # Wait for dramatic effect
+            await asyncio.sleep(3)
+        
+            # Determine result
+            result = random.randint(1, 6)
+            win = result in [5, 6]
+        
+            # Update coins
+            if win:
+                winnings = amount * 2
+                USER_STATS[user_id]["coins"] += winnings
+                result_msg = f"🎉 You rolled a {result} and won 🪙 {winnings}!"
+                color = discord.Color.green()
+                gif = "https://media.giphy.com/media/xUOxfjsW9fWPqEWouI/giphy.gif"
+            else:
+                result_msg = f"😢 You rolled a {result} and lost 🪙 {amount}."
+                color = discord.Color.red()
+                gif = "https://media.giphy.com/media/l3V0j3ytFyGHqiV7W/giphy.gif"
+        
+            # Send result
+            embed = discord.Embed(
+                title=f"🎲 Dice Roll: {result}",
+                description=result_msg,
+                color=color
+            )
+            embed.set_image(url=gif)
+            embed.set_footer(text=f"Current balance: 🪙 {format_amount(USER_STATS[user_id]['coins'])}")
+            await interaction.edit_original_response(embed=embed)
+        finally:
+            finish_game(user_id)
+    
+    @app_commands.command(name="jackpot", description="🎰 Join the Obiz Coin jackpot (🪙 100 entry)")
+    async def jackpot(self, interaction: discord.Interaction):
+        embed = discord.Embed(
+            title="🎰 Obiz Coin Jackpot",
+            description="Join the jackpot for a chance to win big!\nEntry fee: 🪙 100\nWinner takes all!",
+            color=discord.Color.purple()
+        )
+        embed.add_field(name="Current Pool", value=f"🪙 {JACKPOT_POOL['total']}", inline=True)
+        embed.add_field(name="Participants", value=f"👥 {len(JACKPOT_POOL['participants'])}", inline=True)
+        embed.set_footer(text="Drawing occurs when pool reaches 🪙 5000 or every 24 hours")
+        
+        view = JackpotView()
+        await interaction.response.send_message(embed=embed, view=view)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Gambling(bot))
@@ -0,0 +1,145 @@
+import random
+from datetime import datetime
+from typing import Optional
+
+import discord
+from discord import app_commands, ui
+from discord.ext import commands
+
+from core import award, format_amount, start_when_ready, throttle
+from state.games import (
+    GAME_EXPIRY, MINI_GAMES, TRIVIA_BANK, TRIVIA_REWARD, TRIVIA_TIMEOUT, WORD_BANK, WORDLE_REWARDS,
+    WORDLE_TIMEOUT, WordleSession
+)
+
+class TriviaView(ui.View):
+    def __init__(self, user_id: str, question: dict):
+        super().__init__(timeout=None)
+        self.user_id = user_id
+        self.question = question
+        self.message = None
+        
+        choices = [question["answer"]] + question["wrong"]
+        random.shuffle(choices)
+        for choice in choices:
+            button = ui.Button(label=choice[:80], style=discord.ButtonStyle.blurple)
+            button.callback = self.make_callback(choice)
+            self.add_item(button)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return str(interaction.user.id) == self.user_id
+    
+    def make_callback(self, choice: str):
+        async def callback(interaction: discord.Interaction):
+            key = (self.user_id, "trivia")
+            if MINI_GAMES.get(key) is not self:
+                await interaction.response.send_message("⏰ This question has expired.", ephemeral=True)
+                return
+            
+            del MINI_GAMES[key]
+            GAME_EXPIRY.cancel(key)
+            self.stop()
+            if choice == self.question["answer"]:
+                reward = award(self.user_id, coins=TRIVIA_REWARD, xp=5)
+                result = f"✅ Correct! You earned 🪙 {format_amount(reward['coins'])}"
+            else:
+                result = f"❌ Wrong! The answer was **{self.question['answer']}**"
+            await interaction.response.edit_message(embed=self.to_embed(result), view=None)
+        return callback
+    
+    def to_embed(self, result: Optional[str] = None) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"🧠 Trivia: {self.question['category']}",
+            description=self.question["question"],
+            color=discord.Color.blurple() if result is None else discord.Color.dark_grey()
+        )
+        if result:
+            embed.add_field(name="Result", value=result, inline=False)
+        else:
+            embed.set_footer(text=f"You have {int(TRIVIA_TIMEOUT.total_seconds())} seconds • Correct answers earn 🪙 {TRIVIA_REWARD}")
+        return embed
+
+async def expire_game(key: tuple, when: datetime):
+    session = MINI_GAMES.pop(key, None)
+    # Checked by key rather than class, so questions asked before a reload still expire
+    if not session or key[1] != "trivia":
+        return
+    
+    session.stop()
+    if session.message:
+        try:
+            await session.message.edit(embed=session.to_embed(f"⏰ Time's up! The answer was **{session.question['answer']}**"), view=None)
+        except discord.HTTPException:
+            pass
+
+class MiniGames(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    async def cog_load(self):
+        GAME_EXPIRY.callback = expire_game
+        start_when_ready(GAME_EXPIRY.start)
+    
+    async def cog_unload(self):
+        GAME_EXPIRY.stop()
+    
+    @app_commands.command(name="wordle", description="🟩 Guess the five-letter word")
+    @app_commands.describe(guess="Your five-letter guess", hint="Reveal one letter of the word")
+    async def wordle(self, interaction: discord.Interaction, guess: Optional[str] = None, hint: bool = False):
+        user_id = str(interaction.user.id)
+        key = (user_id, "wordle")
+        
+        word = None
+        if guess:
+            word = WORD_BANK.index.get(guess.strip().lower())
+            if word is None:
+                await interaction.response.send_message(f"❌ `{guess[:20]}` isn't in the word list.", ephemeral=True)
+                return
+        
+        session = MINI_GAMES.get(key)
+        if session is None:
+            if not await throttle(interaction, "wordle"):
+                return
+            session = MINI_GAMES[key] = WordleSession(random.randrange(len(WORD_BANK)))
+        GAME_EXPIRY.schedule(key, datetime.now() + WORDLE_TIMEOUT)
+        
+        notice = None
+        if hint:
+            notice = session.hint() or "No hints left for this game"
+        if word is not None:
+            session.guess(word)
+        
+        embed = session.to_embed()
+        if notice:
+            embed.add_field(name="💡 Hint", value=notice, inline=False)
+        
+        if session.over:
+            MINI_GAMES.pop(key, None)
+            GAME_EXPIRY.cancel(key)
+            if session.solved:
+                reward = award(user_id, coins=WORDLE_REWARDS[len(session.guesses) - 1], xp=10)
+                embed.add_field(name="🎉 Solved!", value=f"You earned 🪙 {format_amount(reward['coins'])}", inline=False)
+            else:
+                embed.add_field(name="💀 Out of Guesses", value=f"The word was **{WORD_BANK.words[session.answer].upper()}**", inline=False)
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="trivia", description="🧠 Answer a trivia question for Obiz Coins")
+    async def trivia(self, interaction: discord.Interaction):
+        if not await throttle(interaction, "trivia"):
+            return
+        
+        user_id = str(interaction.user.id)
+        key = (user_id, "trivia")
+        if key in MINI_GAMES:
+            await interaction.response.send_message("🧠 Answer your current trivia question first!", ephemeral=True)
+            return
+        
+        view = TriviaView(user_id, TRIVIA_BANK.draw(interaction.guild_id or 0))
+        MINI_GAMES[key] = view
+        GAME_EXPIRY.schedule(key, datetime.now() + TRIVIA_TIMEOUT)
+        await interaction.response.send_message(embed=view.to_embed(), view=view)
+        view.message = await interaction.original_response()
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(MiniGames(bot))
@@ -0,0 +1,411 @@
+import math
+from datetime import datetime
+from typing import Optional
+
+import discord
+from discord import app_commands, ui
+from discord.ext import commands, tasks
+
+from core import (
+    INVENTORY, SHOP_ITEMS, SHUTTING_DOWN, USER_STATS, bot, format_amount, get_user_stats,
+    is_admin, start_when_ready, throttle
+)
+from state.market import (
+    AUCTION_CLOSINGS, AUCTIONS, LOAN_DAILY_RATE, LOAN_DUES, LOAN_TERM, LOANS, MARKET,
+    MARKET_TICK_TIMES, MAX_LOAN, STOCKS, USER_LOANS, Auction, active_loan, loan_balance,
+    next_auction_id, repay_debt, repay_loan, take_loan
+)
+
+def format_change(change: float) -> str:
+    return f"{'📈' if change >= 0 else '📉'} {change * 100:+.2f}%"
+
+@tasks.loop(time=MARKET_TICK_TIMES)
+async def market_tick():
+    MARKET.tick()
+
+async def default_loan(loan_id: int, when: datetime):
+    """Seize what the borrower can pay and write off the rest"""
+    loan = LOANS.get(loan_id)
+    if not loan or loan["status"] != "active":
+        return
+    
+    owed = loan_balance(loan)
+    seized = repay_loan(loan, owed)
+    if loan["status"] != "active":
+        return
+    
+    loan["status"] = "defaulted"
+    loan["defaulted_amount"] = round(owed - seized, 2)
+    loan["closed_at"] = datetime.now()
+    stats = get_user_stats(loan["user_id"])
+    stats["loan_defaults"] = stats.get("loan_defaults", 0) + 1
+    # What couldn't be seized stays owed; no new loans until it's repaid
+    stats["loan_debt"] = round(stats.get("loan_debt", 0) + loan["defaulted_amount"], 2)
+    
+    user = bot.get_user(int(loan["user_id"]))
+    if user:
+        embed = discord.Embed(
+            title=f"🚨 Loan #{loan_id} Defaulted",
+            description=f"Your loan was due on {loan['due'].strftime('%d %b %Y at %H:%M')} and wasn't repaid.\n"
+                        f"You can't borrow again until the rest is paid off with `/repay`.",
+            color=discord.Color.red()
+        )
+        embed.add_field(name="Seized", value=f"🪙 {seized:.2f}", inline=True)
+        embed.add_field(name="Still Owed", value=f"🪙 {stats['loan_debt']:.2f}", inline=True)
+        try:
+            await user.send(embed=embed)
+        except discord.HTTPException:
+            pass
+
+async def close_auction(auction_id: int, when: datetime):
+    # Settled auctions are dropped; the final edit task keeps this one alive until it's shown
+    auction = AUCTIONS.pop(auction_id, None)
+    if not auction or auction.status != "Open":
+        return
+    
+    auction.status = "Closed"
+    if auction.view:
+        auction.view.stop()
+    leader = auction.leader
+    if leader:
+        amount, user_id, _ = leader
+        auction.escrow.pop(user_id)  # The winning bid is paid to the house
+        INVENTORY.add(user_id, auction.item)
+        
+        winner = bot.get_user(int(user_id))
+        if winner:
+            embed = discord.Embed(
+                title=f"🏆 You Won Auction #{auction.id}!",
+                description=f"**{auction.item}** is yours for 🪙 {amount}",
+                color=discord.Color.green()
+            )
+            try:
+                await winner.send(embed=embed)
+            except discord.HTTPException:
+                pass
+    
+    auction.request_refresh()
+
+async def cancel_open_auctions():
+    """Call off running auctions before a shutdown; bids and escrow aren't snapshotted, so they're refunded"""
+    while AUCTIONS:
+        _, auction = AUCTIONS.popitem()
+        auction.cancel()
+        if auction.message:
+            try:
+                await auction.message.edit(embed=auction.to_embed(), view=None)
+            except discord.HTTPException:
+                pass
+
+class AuctionBidModal(ui.Modal, title="🔨 Place a Bid"):
+    amount = ui.TextInput(
+        label="Bid Amount",
+        placeholder="e.g., 2500",
+        style=discord.TextStyle.short,
+        max_length=10
+    )
+    
+    def __init__(self, auction: Auction):
+        super().__init__()
+        self.auction = auction
+        self.amount.placeholder = f"At least {auction.min_bid()}"
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            amount = int(str(self.amount))
+        except ValueError:
+            await interaction.response.send_message("❌ Please enter a whole number of coins.", ephemeral=True)
+            return
+        await submit_bid(interaction, self.auction, amount)
+
+class AuctionView(ui.View):
+    def __init__(self, auction: Auction):
+        super().__init__(timeout=None)
+        self.auction = auction
+    
+    @ui.button(label="🔨 Bid Minimum", style=discord.ButtonStyle.green)
+    async def bid_minimum(self, interaction: discord.Interaction, button: ui.Button):
+        await submit_bid(interaction, self.auction, self.auction.min_bid())
+    
+    @ui.button(label="✍️ Custom Bid", style=discord.ButtonStyle.blurple)
+    async def bid_custom(self, interaction: discord.Interaction, button: ui.Button):
+        await interaction.response.send_modal(AuctionBidModal(self.auction))
+
+async def submit_bid(interaction: discord.Interaction, auction: Auction, amount: int):
+    if not await throttle(interaction, "bid"):
+        return
+    
+    error = auction.place_bid(interaction.user, amount)
+    if error:
+        await interaction.response.send_message(f"❌ {error}", ephemeral=True)
+    else:
+        await interaction.response.send_message(f"✅ You're leading auction #{auction.id} with 🪙 {amount}!", ephemeral=True)
+
+class Market(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    async def cog_load(self):
+        LOAN_DUES.callback = default_loan
+        AUCTION_CLOSINGS.callback = close_auction
+        start_when_ready(market_tick.start, LOAN_DUES.start, AUCTION_CLOSINGS.start)
+    
+    async def cog_unload(self):
+        market_tick.cancel()
+        LOAN_DUES.stop()
+        AUCTION_CLOSINGS.stop()
+        if SHUTTING_DOWN.is_set():
+            await cancel_open_auctions()
+    
+    @app_commands.command(name="stocks", description="📈 View fictional stock prices")
+    async def stocks(self, interaction: discord.Interaction):
+        embed = discord.Embed(
+            title="📈 Obiz Stock Exchange",
+            description="Prices move every hour. Use `/invest` to trade!",
+            color=discord.Color.teal()
+        )
+        
+        for ticker in MARKET.tickers:
+            quote = MARKET.quote(ticker)
+            embed.add_field(
+                name=f"{ticker} • {quote['company']}",
+                value=f"🪙 {quote['price']:.2f}\nDay: {format_change(quote['day'])}\nWeek: {format_change(quote['week'])}",
+                inline=True
+            )
+        
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="invest", description="💹 Buy or sell fictional stocks with Obiz Coins")
+    @app_commands.describe(action="Buy or sell", ticker="Stock to trade", shares="Number of shares")
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="Buy", value="buy"),
+            app_commands.Choice(name="Sell", value="sell")
+        ],
+        ticker=[app_commands.Choice(name=f"{ticker} - {details[0]}", value=ticker) for ticker, details in STOCKS.items()]
+    )
+    async def invest(self, interaction: discord.Interaction, action: app_commands.Choice[str], ticker: app_commands.Choice[str], shares: int):
+        if not await throttle(interaction, "invest"):
+            return
+        
+        if shares <= 0:
+            embed = discord.Embed(
+                title="❌ Invalid Amount",
+                description="You must trade at least 1 share",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        user_id = str(interaction.user.id)
+        stats = get_user_stats(user_id)
+        quote = MARKET.quote(ticker.value)
+        
+        if action.value == "buy":
+            cost = round(shares * quote["price"], 2)
+            if stats["coins"] < cost:
+                embed = discord.Embed(
+                    title="❌ Insufficient Funds",
+                    description=f"{shares} {ticker.value} costs 🪙 {cost:.2f}, you only have 🪙 {format_amount(stats['coins'])}",
+                    color=discord.Color.red()
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+            
+            stats["coins"] -= MARKET.trade(user_id, ticker.value, shares)
+            title = f"💹 Bought {shares} {ticker.value}"
+        else:
+            owned = MARKET.shares(user_id, ticker.value)
+            if owned < shares:
+                embed = discord.Embed(
+                    title="❌ Not Enough Shares",
+                    description=f"You only own {owned:g} {ticker.value}",
+                    color=discord.Color.red()
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+            
+            stats["coins"] -= MARKET.trade(user_id, ticker.value, -shares)
+            title = f"💰 Sold {shares} {ticker.value}"
+        
+        embed = discord.Embed(
+            title=title,
+            description=f"at 🪙 {quote['price']:.2f} per share",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Portfolio Value", value=f"🪙 {MARKET.portfolio_value(user_id):.2f}", inline=True)
+        embed.add_field(name="Balance", value=f"🪙 {format_amount(stats['coins'])}", inline=True)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="portfolio", description="💼 View your stock portfolio")
+    async def portfolio(self, interaction: discord.Interaction):
+        user_id = str(interaction.user.id)
+        positions = MARKET.positions(user_id)
+        
+        if not positions:
+            embed = discord.Embed(
+                description="📭 You don't own any stocks yet. Use `/invest` to get started!",
+                color=discord.Color.blue()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title=f"💼 {interaction.user.display_name}'s Portfolio",
+            description=f"Total value: 🪙 {MARKET.portfolio_value(user_id):.2f}",
+            color=discord.Color.teal()
+        )
+        for ticker, shares, value in positions:
+            embed.add_field(
+                name=f"{ticker} × {shares:g}",
+                value=f"🪙 {value:.2f} ({format_change(MARKET.quote(ticker)['day'])} today)",
+                inline=True
+            )
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="loan", description="🏦 Borrow Obiz Coins with interest")
+    @app_commands.describe(amount=f"Coins to borrow (max {MAX_LOAN})")
+    async def borrow(self, interaction: discord.Interaction, amount: int):
+        if not await throttle(interaction, "loan"):
+            return
+        
+        if amount <= 0 or amount > MAX_LOAN:
+            embed = discord.Embed(
+                title="❌ Invalid Amount",
+                description=f"You can borrow between 🪙 1 and 🪙 {MAX_LOAN}",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        user_id = str(interaction.user.id)
+        current = active_loan(user_id)
+        if current:
+            embed = discord.Embed(
+                title="❌ Loan Already Active",
+                description=f"Repay loan #{current['id']} (🪙 {loan_balance(current):.2f} owed) with `/repay` first",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        debt = get_user_stats(user_id).get("loan_debt", 0)
+        if debt > 0:
+            embed = discord.Embed(
+                title="❌ Unpaid Default",
+                description=f"You still owe 🪙 {debt:.2f} from a defaulted loan. Pay it off with `/repay` before borrowing again",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        new_loan = take_loan(user_id, amount)
+        embed = discord.Embed(
+            title=f"🏦 Loan #{new_loan['id']} Approved",
+            description=f"🪙 {amount} has been added to your balance",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Interest", value=f"{LOAN_DAILY_RATE * 100:g}% per day", inline=True)
+        embed.add_field(name="Due", value=new_loan["due"].strftime("%d %b %Y at %H:%M"), inline=True)
+        embed.add_field(name="Owed at Due Date", value=f"🪙 {amount * math.exp(LOAN_DAILY_RATE * LOAN_TERM.days):.2f}", inline=False)
+        embed.set_footer(text="Unpaid loans are seized from your balance when due")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="repay", description="💳 Repay your active loan or defaulted debt")
+    @app_commands.describe(amount="Coins to repay (defaults to the full balance)")
+    async def repay(self, interaction: discord.Interaction, amount: Optional[int] = None):
+        user_id = str(interaction.user.id)
+        stats = get_user_stats(user_id)
+        current = active_loan(user_id)
+        if not current and not stats.get("loan_debt"):
+            embed = discord.Embed(
+                description="📭 You don't have an active loan or unpaid debt",
+                color=discord.Color.blue()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if current:
+            paid = repay_loan(current, amount if amount is not None else loan_balance(current))
+            remaining = loan_balance(current)
+        else:
+            paid = repay_debt(user_id, amount if amount is not None else stats["loan_debt"])
+            remaining = stats["loan_debt"]
+        if not paid:
+            embed = discord.Embed(
+                title="❌ Nothing Repaid",
+                description="You need coins in your balance to repay your loan",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title=f"💳 Repaid 🪙 {paid:.2f}",
+            description=f"Remaining balance: 🪙 {remaining:.2f}" if remaining > 0 else "🎉 Fully repaid!",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Your Balance", value=f"🪙 {format_amount(USER_STATS[user_id]['coins'])}", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="loans", description="📜 View your loan history")
+    async def loan_history(self, interaction: discord.Interaction):
+        user_id = str(interaction.user.id)
+        loan_ids = USER_LOANS.get(user_id, [])
+        if not loan_ids:
+            embed = discord.Embed(
+                description="📭 You have never taken a loan",
+                color=discord.Color.blue()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        status_emojis = {"active": "⏳", "repaid": "✅", "defaulted": "🚨"}
+        embed = discord.Embed(
+            title=f"📜 {interaction.user.display_name}'s Loans",
+            color=discord.Color.blurple()
+        )
+        for loan_id in reversed(loan_ids[-10:]):
+            entry = LOANS[loan_id]
+            details = f"Borrowed 🪙 {entry['principal']} on {entry['taken_at'].strftime('%d %b %Y')}\nRepaid 🪙 {entry['repaid']:.2f}"
+            if entry["status"] == "active":
+                details += f"\nOwed 🪙 {loan_balance(entry):.2f}, due {entry['due'].strftime('%d %b %Y at %H:%M')}"
+            elif entry["status"] == "defaulted":
+                details += f"\nWritten off 🪙 {entry['defaulted_amount']:.2f}"
+            embed.add_field(
+                name=f"{status_emojis[entry['status']]} Loan #{loan_id} • {entry['status'].capitalize()}",
+                value=details,
+                inline=False
+            )
+        
+        stats = get_user_stats(user_id)
+        footer = f"{len(loan_ids)} loans • {stats.get('loan_defaults', 0)} defaults"
+        if stats.get("loan_debt"):
+            footer += f" • 🪙 {stats['loan_debt']:.2f} still owed"
+        embed.set_footer(text=footer)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="auction", description="🔨 Start an auction for a shop item (Admin only)")
+    @app_commands.describe(item="Shop item to auction", starting_bid="Opening bid (defaults to half the shop price)")
+    @app_commands.choices(item=[app_commands.Choice(name=item, value=item) for item in SHOP_ITEMS])
+    async def start_auction(self, interaction: discord.Interaction, item: app_commands.Choice[str], starting_bid: Optional[int] = None):
+        if not is_admin(interaction.user):
+            embed = discord.Embed(
+                title="❌ Permission Denied",
+                description="You need admin privileges to start auctions",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        auction = Auction(next_auction_id(), item.value, interaction.user, starting_bid or SHOP_ITEMS[item.value]["price"] // 2)
+        AUCTIONS[auction.id] = auction
+        AUCTION_CLOSINGS.schedule(auction.id, auction.ends_at)
+        
+        auction.view = AuctionView(auction)
+        await interaction.response.send_message(embed=auction.to_embed(), view=auction.view)
+        auction.message = await interaction.original_response()
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Market(bot))
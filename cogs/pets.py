@@ -0,0 +1,142 @@
+import time
+from datetime import datetime
+from typing import Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core import award, bot, format_amount, get_user_stats, start_when_ready, throttle
+from state.pets import (
+    PET_ADOPT_COST, PET_ALERTS, PET_FEED_COST, PET_FULL, PET_HUNGER_PER_HOUR, PET_LEVEL_UP_BONUS,
+    PET_SPECIES, PET_STARVING, PETS, Pet, schedule_pet_alert
+)
+
+async def pet_alert(user_id: str, when: datetime):
+    pet = PETS.get(user_id)
+    if not pet:
+        return
+    
+    now = time.time()
+    next_alert = pet.next_alert(now)
+    if next_alert:
+        PET_ALERTS.schedule(user_id, datetime.fromtimestamp(next_alert))
+    
+    owner = bot.get_user(int(user_id))
+    if not owner:
+        return
+    if pet.hunger(now) >= PET_STARVING:
+        description = f"{pet.name} is starving and losing XP! Use `/feedpet` right away."
+    else:
+        description = f"{pet.name} is getting hungry and has stopped earning coins. Use `/feedpet` to cheer them up."
+    embed = discord.Embed(
+        title=f"{PET_SPECIES[pet.species]} {pet.name} Needs You!",
+        description=description,
+        color=discord.Color.orange()
+    )
+    try:
+        await owner.send(embed=embed)
+    except discord.HTTPException:
+        pass
+
+class Pets(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    async def cog_load(self):
+        PET_ALERTS.callback = pet_alert
+        start_when_ready(PET_ALERTS.start)
+    
+    async def cog_unload(self):
+        PET_ALERTS.stop()
+    
+    @app_commands.command(name="adoptpet", description=f"🐾 Adopt a virtual pet (🪙 {PET_ADOPT_COST})")
+    @app_commands.describe(name="Your pet's name", species="What kind of pet")
+    @app_commands.choices(species=[app_commands.Choice(name=f"{emoji} {species}", value=species) for species, emoji in PET_SPECIES.items()])
+    async def adopt_pet(self, interaction: discord.Interaction, name: app_commands.Range[str, 1, 32], species: str):
+        user_id = str(interaction.user.id)
+        if user_id in PETS:
+            pet = PETS[user_id]
+            await interaction.response.send_message(f"🐾 You already have {PET_SPECIES[pet.species]} **{pet.name}**!", ephemeral=True)
+            return
+        
+        stats = get_user_stats(user_id)
+        if stats["coins"] < PET_ADOPT_COST:
+            embed = discord.Embed(
+                title="❌ Insufficient Funds",
+                description=f"Adopting a pet costs 🪙 {PET_ADOPT_COST}, but you only have 🪙 {format_amount(stats['coins'])}",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        stats["coins"] -= PET_ADOPT_COST
+        now = time.time()
+        pet = PETS[user_id] = Pet(user_id, name, species, now, now, 0, 0, now)
+        pet.save()
+        schedule_pet_alert(pet, now)
+        
+        embed = pet.to_embed(now)
+        embed.set_author(name="🎉 Welcome to the family!")
+        embed.set_footer(text=f"Feed {name} with /feedpet to keep them happy and earning coins")
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="feedpet", description=f"🍖 Feed your pet (🪙 {PET_FEED_COST})")
+    async def feed_pet(self, interaction: discord.Interaction):
+        if not await throttle(interaction, "feedpet"):
+            return
+        
+        user_id = str(interaction.user.id)
+        pet = PETS.get(user_id)
+        if not pet:
+            await interaction.response.send_message("🐾 You don't have a pet yet! Use `/adoptpet` to adopt one.", ephemeral=True)
+            return
+        
+        now = time.time()
+        hunger = pet.hunger(now)
+        if hunger < PET_FULL:
+            hungry_at = datetime.fromtimestamp(now + (PET_FULL - hunger) / PET_HUNGER_PER_HOUR * 3600)
+            await interaction.response.send_message(f"🍖 {pet.name} is full! Try again {discord.utils.format_dt(hungry_at, 'R')}.", ephemeral=True)
+            return
+        
+        stats = get_user_stats(user_id)
+        if stats["coins"] < PET_FEED_COST:
+            await interaction.response.send_message(f"❌ Pet food costs 🪙 {PET_FEED_COST}, but you only have 🪙 {format_amount(stats['coins'])}", ephemeral=True)
+            return
+        
+        stats["coins"] -= PET_FEED_COST
+        earned = pet.settle(now)
+        levels = pet.feed(now)
+        pet.save()
+        schedule_pet_alert(pet, now)
+        
+        embed = pet.to_embed(now)
+        embed.set_author(name=f"🍖 You fed {pet.name}!")
+        if earned:
+            embed.add_field(name="💰 Collected", value=f"🪙 {format_amount(earned)} earned since last time", inline=False)
+        if levels > 0:
+            bonus = award(user_id, coins=PET_LEVEL_UP_BONUS * levels)
+            embed.add_field(name="🎉 Level Up!", value=f"{pet.name} reached level {pet.level(now)}! Bonus: 🪙 {format_amount(bonus['coins'])}", inline=False)
+        await interaction.response.send_message(embed=embed)
+    
+    @app_commands.command(name="petstatus", description="🐾 Check on a pet")
+    @app_commands.describe(member="Whose pet to check (defaults to yours)")
+    async def pet_status(self, interaction: discord.Interaction, member: Optional[discord.Member] = None):
+        owner = member or interaction.user
+        pet = PETS.get(str(owner.id))
+        if not pet:
+            await interaction.response.send_message(f"🐾 {owner.display_name} doesn't have a pet yet.", ephemeral=True)
+            return
+        
+        now = time.time()
+        embed = pet.to_embed(now)
+        if owner == interaction.user:
+            earned = pet.settle(now)
+            pet.save()
+            if earned:
+                embed.add_field(name="💰 Collected", value=f"🪙 {format_amount(earned)} earned since last time", inline=False)
+        embed.set_footer(text=f"Owned by {owner.display_name}")
+        await interaction.response.send_message(embed=embed)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Pets(bot))
@@ -0,0 +1,812 @@
+import math
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import discord
+from discord import app_commands, ui
+from discord.ext import commands, tasks
+
+from core import AUDIT_LOG, USER_STATS, bot, count_activity, is_admin, start_when_ready
+from state.tickets import (
+    CATEGORIES, CLOSED_STATUSES, COMMENTS_PER_PAGE, DEADLINE_FORMAT, DEADLINE_INDEX,
+    INACTIVITY_CLOSE_AFTER, INACTIVITY_INDEX, INACTIVITY_WARNING, PRIORITY_OPTIONS, REMINDERS,
+    SEARCH_INDEX, STATUS_EMOJIS, TICKETS_DB, Ticket, index_ticket, index_ticket_deadline,
+    load_comment_page, next_ticket_id, parse_deadline, restore_saved_tickets,
+    unindex_ticket_deadline
+)
+
+class TicketModal(ui.Modal, title="✨ Create Premium Ticket"):
+    task_title = ui.TextInput(
+        label="Task Title", 
+        placeholder="e.g., Fix dashboard UI bugs",
+        style=discord.TextStyle.short,
+        max_length=100
+    )
+    
+    task_description = ui.TextInput(
+        label="Task Description", 
+        placeholder="Describe the task in detail...", 
+        style=discord.TextStyle.long
+    )
+    
+    deadline = ui.TextInput(
+        label="Deadline (DD/MM/YYYY)", 
+        placeholder="e.g., 30/06/2023",
+        style=discord.TextStyle.short,
+        max_length=10
+    )
+
+    category = ui.TextInput(
+        label="Category (IT/HR/Finance/Marketing/General)",
+        placeholder="e.g., IT",
+        style=discord.TextStyle.short,
+        max_length=20
+    )
+
+    priority = ui.TextInput(
+        label="Priority (Critical/High/Medium/Low)",
+        placeholder="e.g., High",
+        style=discord.TextStyle.short,
+        max_length=10
+    )
+
+    def __init__(self, assignees: List[discord.Member]):
+        super().__init__(timeout=300)
+        self.assignees = assignees
+        self.deadline_at = None
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            self.deadline_at = parse_deadline(str(self.deadline))
+        except ValueError as e:
+            embed = discord.Embed(
+                title="❌ Invalid Deadline",
+                description=str(e),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Picking an assignee calls create_ticket from the select's own callback
+        await interaction.response.send_message(
+            "Please select an assignee for this ticket:",
+            view=AssigneeSelectView(self, interaction),
+            ephemeral=True
+        )
+    
+    async def create_ticket(self, interaction: discord.Interaction, assignee: discord.Member):
+        ticket_id = next_ticket_id()
+        
+        ticket = Ticket(
+            ticket_id=ticket_id,
+            creator=interaction.user,
+            assignee=assignee,
+            title=str(self.task_title),
+            description=str(self.task_description),
+            deadline=self.deadline_at,
+            priority=str(self.priority),
+            category=str(self.category)
+        )
+        
+        TICKETS_DB[ticket_id] = ticket
+        index_ticket_deadline(ticket)
+        index_ticket(ticket)
+        INACTIVITY_INDEX.schedule(ticket.id, ticket.last_activity + INACTIVITY_CLOSE_AFTER - INACTIVITY_WARNING)
+        
+        embed = ticket.to_embed()
+        embed.set_author(name="New Ticket Created!", icon_url=interaction.user.avatar.url)
+        
+        view = ticket_actions_view(ticket_id)
+        
+        await interaction.response.send_message(
+            content=f"🎉 Ticket #{ticket_id} created successfully!",
+            embed=embed,
+            view=view
+        )
+        
+        try:
+            dm_embed = discord.Embed(
+                title=f"📬 New Ticket Assigned: #{ticket_id}",
+                description=f"You've been assigned a new ticket by {interaction.user.mention}",
+                color=discord.Color.blurple()
+            )
+            dm_embed.add_field(name="Title", value=ticket.title, inline=False)
+            dm_embed.add_field(name="Priority", value=ticket.priority, inline=True)
+            dm_embed.add_field(name="Deadline", value=f"`{ticket.deadline}`", inline=True)
+            dm_embed.set_thumbnail(url="https://i.imgur.com/J5h8x2V.png")
+            dm_embed.set_footer(text="Please respond promptly to this ticket")
+            
+            await assignee.send(embed=dm_embed)
+        except discord.Forbidden:
+            pass
+
+class AssigneeSelectView(ui.View):
+    """The assignee step of ticket creation.
+
+    The pick is handled by the select's callback, which discord.py finds
+    by custom ID, so pending creations cost nothing on other interactions.
+    """
+    
+    def __init__(self, modal: TicketModal, interaction: discord.Interaction):
+        super().__init__(timeout=180)
+        self.modal = modal
+        self.interaction = interaction
+        
+        self.select = ui.Select(
+            placeholder="👤 Select Assignee",
+            options=[discord.SelectOption(label=member.display_name, value=str(member.id)) for member in modal.assignees],
+            min_values=1,
+            max_values=1
+        )
+        self.select.callback = self.on_select
+        self.add_item(self.select)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.interaction.user.id
+    
+    async def on_select(self, interaction: discord.Interaction):
+        assignee = interaction.guild.get_member(int(self.select.values[0]))
+        if not assignee:
+            await interaction.response.send_message("❌ That member is no longer in the server.", ephemeral=True)
+            return
+        
+        self.stop()
+        await self.modal.create_ticket(interaction, assignee)
+    
+    async def on_timeout(self):
+        try:
+            await self.interaction.followup.send("Ticket creation timed out.", ephemeral=True)
+        except discord.HTTPException:
+            pass
+
+TICKET_ACTION_PREFIX = "ticket"
+TICKET_BUTTONS = [  # (TicketActions method, label, style)
+    ("add_comment", "📝 Add Comment", discord.ButtonStyle.blurple),
+    ("attach_file", "📎 Attach File", discord.ButtonStyle.green),
+    ("set_reminder", "⏰ Set Reminder", discord.ButtonStyle.grey),
+    ("transfer_ticket", "🔄 Transfer", discord.ButtonStyle.red),
+    ("complete_ticket", "✅ Mark Complete", discord.ButtonStyle.green),
+    ("comment_history", "📜 Comment History", discord.ButtonStyle.grey)
+]
+TICKET_ACTION_NAMES = {action for action, _, _ in TICKET_BUTTONS}
+
+def ticket_custom_id(action: str, ticket_id: int) -> str:
+    return f"{TICKET_ACTION_PREFIX}:{action}:{ticket_id}"
+
+def ticket_actions_view(ticket_id: int) -> ui.View:
+    """The action buttons for a ticket message.
+
+    Each button's custom ID carries its action and the ticket ID, and clicks
+    are routed by on_ticket_action rather than by this view, so the view is
+    finished before it is sent and never kept in the view store. Nothing is
+    held per message, and since ticket numbers are never reused, a button
+    on an old message can only ever act on its own ticket.
+    """
+    view = ui.View(timeout=None)
+    for action, label, style in TICKET_BUTTONS:
+        view.add_item(ui.Button(label=label, style=style, custom_id=ticket_custom_id(action, ticket_id)))
+    view.stop()
+    return view
+
+class TicketActions:
+    """Handlers for the ticket action buttons, one method per entry in TICKET_BUTTONS"""
+    
+    def __init__(self, ticket_id: int):
+        self.ticket_id = ticket_id
+    
+    async def add_comment(self, interaction: discord.Interaction):
+        await interaction.response.send_modal(CommentModal(self.ticket_id))
+    
+    async def attach_file(self, interaction: discord.Interaction):
+        await interaction.response.send_message(
+            "📤 Please upload your file in this channel. It will be automatically attached to the ticket.",
+            ephemeral=True
+        )
+    
+    async def set_reminder(self, interaction: discord.Interaction):
+        await interaction.response.send_modal(ReminderModal(self.ticket_id))
+    
+    async def transfer_ticket(self, interaction: discord.Interaction):
+        ticket = TICKETS_DB.get(self.ticket_id)
+        if not ticket:
+            await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
+            return
+        
+        if interaction.user.id not in [ticket.assignee.id, ticket.creator.id]:
+            await interaction.response.send_message("🚫 You don't have permission to transfer this ticket.", ephemeral=True)
+            return
+        
+        view = TransferView(self.ticket_id, interaction.user)
+        await interaction.response.send_message(
+            f"🔄 Select a new assignee for ticket #{self.ticket_id}:",
+            view=view,
+            ephemeral=True
+        )
+    
+    async def complete_ticket(self, interaction: discord.Interaction):
+        ticket = TICKETS_DB.get(self.ticket_id)
+        if not ticket:
+            await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
+            return
+        
+        if interaction.user.id not in [ticket.assignee.id, ticket.creator.id]:
+            await interaction.response.send_message("🚫 You don't have permission to complete this ticket.", ephemeral=True)
+            return
+        
+        # Old ticket messages keep their buttons, so a finished ticket must not be resolved (and paid) again
+        if ticket.status in CLOSED_STATUSES:
+            await interaction.response.send_message(f"{STATUS_EMOJIS.get(ticket.status)} Ticket #{ticket.id} is already {ticket.status}.", ephemeral=True)
+            return
+        
+        ticket.status = "Completed"
+        ticket.completed_at = datetime.now()
+        ticket.touch()
+        unindex_ticket_deadline(ticket.id)
+        INACTIVITY_INDEX.cancel(ticket.id)
+        count_activity(str(ticket.assignee.id), "tickets_resolved")
+        AUDIT_LOG.record("tickets", interaction.guild, f"✅ Ticket #{ticket.id} **{ticket.title}** marked Completed by {interaction.user.mention}")
+        
+        # Calculate coins based on completion time
+        if ticket.completed_at > ticket.deadline_at:
+            hours_late = (ticket.completed_at - ticket.deadline_at).total_seconds() / 3600
+            coins_lost = min(0.1 * hours_late, 10)  # Max 10 coins penalty
+            user_id = str(interaction.user.id)
+            if user_id in USER_STATS:
+                USER_STATS[user_id]["coins"] = max(0, USER_STATS[user_id]["coins"] - coins_lost)
+        
+        embed = ticket.to_embed()
+        embed.set_author(name=f"Ticket #{self.ticket_id} Completed!", icon_url=interaction.user.avatar.url)
+        
+        await interaction.response.edit_message(embed=embed, view=None)
+        
+        try:
+            # Notify creator
+            creator_embed = discord.Embed(
+                title=f"✅ Ticket Completed: #{self.ticket_id}",
+                description=f"Your ticket has been completed by {interaction.user.mention}",
+                color=discord.Color.green()
+            )
+            await ticket.creator.send(embed=creator_embed)
+        except discord.Forbidden:
+            pass
+    
+    async def comment_history(self, interaction: discord.Interaction):
+        ticket = TICKETS_DB.get(self.ticket_id)
+        if not ticket:
+            await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
+            return
+        
+        if interaction.user.id not in [ticket.assignee.id, ticket.creator.id]:
+            await interaction.response.send_message("🚫 You don't have permission to view this ticket's comments.", ephemeral=True)
+            return
+        
+        if not ticket.comment_count:
+            await interaction.response.send_message("💬 This ticket has no comments yet.", ephemeral=True)
+            return
+        
+        view = CommentHistoryView(ticket)
+        await interaction.response.send_message(embed=view.to_embed(), view=view, ephemeral=True)
+
+class CommentHistoryView(ui.View):
+    """Pages through a ticket's comments, newest first, loading one page per click"""
+    
+    def __init__(self, ticket: Ticket):
+        super().__init__(timeout=180)
+        self.ticket = ticket
+        self.cursors = [None]  # cursors[page] is the comment id that page starts below
+        self.comments = load_comment_page(ticket.id)
+        self.update_buttons()
+    
+    @property
+    def page(self) -> int:
+        return len(self.cursors) - 1
+    
+    def update_buttons(self):
+        self.newer.disabled = self.page == 0
+        self.older.disabled = (self.page + 1) * COMMENTS_PER_PAGE >= self.ticket.comment_count
+    
+    def to_embed(self) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"📜 Comments on Ticket #{self.ticket.id}",
+            color=discord.Color.blurple()
+        )
+        for comment in self.comments:
+            embed.add_field(
+                name=f"{comment['author']} • {comment['timestamp'].strftime('%d %b %Y %H:%M')}",
+                value=comment["content"][:1024],
+                inline=False
+            )
+        pages = max(1, math.ceil(self.ticket.comment_count / COMMENTS_PER_PAGE))
+        embed.set_footer(text=f"Page {self.page + 1}/{pages} • {self.ticket.comment_count} comments")
+        return embed
+    
+    @ui.button(label="◀️ Newer", style=discord.ButtonStyle.grey)
+    async def newer(self, interaction: discord.Interaction, button: ui.Button):
+        self.cursors.pop()
+        self.comments = load_comment_page(self.ticket.id, self.cursors[-1])
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.to_embed(), view=self)
+    
+    @ui.button(label="Older ▶️", style=discord.ButtonStyle.grey)
+    async def older(self, interaction: discord.Interaction, button: ui.Button):
+        self.cursors.append(self.comments[-1]["id"])
+        self.comments = load_comment_page(self.ticket.id, self.cursors[-1])
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.to_embed(), view=self)
+
+class CommentModal(ui.Modal, title="💬 Add Comment"):
+    comment = ui.TextInput(
+        label="Your Comment", 
+        style=discord.TextStyle.long,
+        placeholder="Type your comment here...",
+        required=True
+    )
+
+    def __init__(self, ticket_id: int):
+        super().__init__()
+        self.ticket_id = ticket_id
+
+    async def on_submit(self, interaction: discord.Interaction):
+        ticket = TICKETS_DB.get(self.ticket_id)
+        if not ticket:
+            await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
+            return
+        
+        ticket.add_comment(interaction.user.display_name, str(self.comment))
+        ticket.touch()
+        SEARCH_INDEX.add(ticket.id, str(self.comment))
+        
+        embed = discord.Embed(
+            description=f"💬 Comment added to ticket #{self.ticket_id}",
+            color=discord.Color.green()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        
+        channel = interaction.channel
+        try:
+            message = await channel.fetch_message(interaction.message.id)
+            await message.edit(embed=ticket.to_embed())
+        except:
+            pass
+
+class ReminderModal(ui.Modal, title="⏰ Set Reminder"):
+    when = ui.TextInput(
+        label="Reminder Time (DD/MM/YYYY HH:MM)", 
+        placeholder="e.g., 30/06/2023 14:30",
+        required=True
+    )
+    note = ui.TextInput(
+        label="Reminder Note (Optional)", 
+        style=discord.TextStyle.long,
+        required=False
+    )
+
+    def __init__(self, ticket_id: int):
+        super().__init__()
+        self.ticket_id = ticket_id
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            reminder_time = datetime.strptime(str(self.when), "%d/%m/%Y %H:%M")
+            if reminder_time < datetime.now():
+                raise ValueError("Reminder time must be in the future")
+            
+            REMINDERS.append({
+                "ticket_id": self.ticket_id,
+                "user_id": interaction.user.id,
+                "time": reminder_time,
+                "note": str(self.note) if self.note else None
+            })
+            
+            embed = discord.Embed(
+                description=f"⏰ Reminder set for {reminder_time.strftime('%d %b %Y at %H:%M')}",
+                color=discord.Color.gold()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        except ValueError as e:
+            embed = discord.Embed(
+                description=f"❌ Invalid time format: {e}",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+class TransferView(ui.View):
+    def __init__(self, ticket_id: int, current_assignee: discord.Member):
+        super().__init__(timeout=120)
+        self.ticket_id = ticket_id
+        self.current_assignee = current_assignee
+        
+        members = [
+            m for m in current_assignee.guild.members 
+            if not m.bot and m.id != current_assignee.id
+        ]
+        
+        options = [
+            discord.SelectOption(
+                label=f"{m.display_name} ({m.name})",
+                value=str(m.id),
+                emoji="👤"
+            ) for m in members
+        ]
+        
+        self.select = ui.Select(
+            placeholder="👥 Select new assignee...",
+            options=options,
+            min_values=1,
+            max_values=1
+        )
+        
+        self.add_item(self.select)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.current_assignee.id
+    
+    @ui.button(label="✅ Confirm Transfer", style=discord.ButtonStyle.green, row=1)
+    async def confirm(self, interaction: discord.Interaction, button: ui.Button):
+        new_assignee_id = int(self.select.values[0])
+        ticket = TICKETS_DB.get(self.ticket_id)
+        
+        if not ticket:
+            await interaction.response.send_message("❌ Ticket not found.", ephemeral=True)
+            return
+        
+        new_assignee = interaction.guild.get_member(new_assignee_id)
+        old_assignee = ticket.assignee
+        ticket.assignee = new_assignee
+        ticket.touch()
+        AUDIT_LOG.record(
+            "tickets", interaction.guild,
+            f"🔄 Ticket #{ticket.id} **{ticket.title}** transferred from {old_assignee.mention} to {new_assignee.mention}"
+        )
+        
+        embed = discord.Embed(
+            description=f"🔄 Ticket #{self.ticket_id} transferred to {new_assignee.mention}",
+            color=discord.Color.green()
+        )
+        await interaction.response.send_message(embed=embed)
+        
+        try:
+            new_assignee_embed = discord.Embed(
+                title=f"📬 Ticket Assigned: #{self.ticket_id}",
+                description=f"You've been assigned a ticket by {old_assignee.mention}",
+                color=discord.Color.blurple()
+            )
+            new_assignee_embed.add_field(name="Title", value=ticket.title, inline=False)
+            new_assignee_embed.set_footer(text=f"Priority: {ticket.priority} | Deadline: {ticket.deadline}")
+            await new_assignee.send(embed=new_assignee_embed)
+            
+            old_assignee_embed = discord.Embed(
+                title=f"🔄 Ticket Transferred: #{self.ticket_id}",
+                description=f"You've transferred a ticket to {new_assignee.mention}",
+                color=discord.Color.blue()
+            )
+            await old_assignee.send(embed=old_assignee_embed)
+        except discord.Forbidden:
+            pass
+        
+        self.stop()
+
+    @ui.button(label="❌ Cancel", style=discord.ButtonStyle.red, row=1)
+    async def cancel(self, interaction: discord.Interaction, button: ui.Button):
+        embed = discord.Embed(
+            description="🚫 Ticket transfer cancelled",
+            color=discord.Color.red()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        self.stop()
+
+async def ticket_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[int]]:
+    tickets = []
+    for ticket in TICKETS_DB.values():
+        if interaction.user.id in [ticket.assignee.id, ticket.creator.id]:
+            if current.lower() in str(ticket.id) or current.lower() in ticket.title.lower():
+                emoji = STATUS_EMOJIS.get(ticket.status, "📌")
+                tickets.append(
+                    app_commands.Choice(
+                        name=f"#{ticket.id} {emoji} {ticket.title[:50]}",
+                        value=ticket.id
+                    )
+                )
+    return tickets[:25]
+
+async def notify_deadline(key, when: datetime):
+    kind, ticket_id = key
+    ticket = TICKETS_DB.get(ticket_id)
+    if not ticket or ticket.status in CLOSED_STATUSES:
+        return
+    
+    if kind == "due_soon":
+        embed = discord.Embed(
+            title=f"⏳ Deadline Approaching: Ticket #{ticket.id}",
+            description=f"**{ticket.title}** is due on `{ticket.deadline}`",
+            color=discord.Color.orange()
+        )
+        recipients = [ticket.assignee]
+    else:
+        embed = discord.Embed(
+            title=f"🚨 Ticket Overdue: #{ticket.id}",
+            description=f"**{ticket.title}** passed its deadline of `{ticket.deadline}`",
+            color=discord.Color.red()
+        )
+        recipients = [ticket.assignee, ticket.creator]
+    embed.add_field(name="Status", value=f"{STATUS_EMOJIS.get(ticket.status)} {ticket.status}", inline=True)
+    embed.add_field(name="Priority", value=ticket.priority, inline=True)
+    
+    for user in {r.id: r for r in recipients if r}.values():
+        try:
+            await user.send(embed=embed)
+        except discord.HTTPException:
+            pass
+
+async def check_inactivity(ticket_id: int, when: datetime):
+    """Warn about, then close, a ticket nobody has touched for a week.
+
+    Activity only updates ``Ticket.last_activity``; the index entry is
+    re-armed from that timestamp when it fires, so quiet tickets are the
+    only ones that cost any work.
+    """
+    ticket = TICKETS_DB.get(ticket_id)
+    if not ticket or ticket.status in CLOSED_STATUSES:
+        return
+    
+    close_at = ticket.last_activity + INACTIVITY_CLOSE_AFTER
+    warn_at = close_at - INACTIVITY_WARNING
+    now = datetime.now()
+    
+    if not ticket.inactivity_warned:
+        if now < warn_at:
+            INACTIVITY_INDEX.schedule(ticket_id, warn_at)
+            return
+        
+        ticket.inactivity_warned = True
+        # Always give the full warning period, even if the warning is late
+        INACTIVITY_INDEX.schedule(ticket_id, max(close_at, now + INACTIVITY_WARNING))
+        embed = discord.Embed(
+            title=f"⚠️ Inactive Ticket: #{ticket.id}",
+            description=f"**{ticket.title}** has had no activity since {ticket.last_activity.strftime('%d %b %Y')}.\n"
+                        f"It will be closed automatically in 24 hours unless someone comments or updates it.",
+            color=discord.Color.orange()
+        )
+    else:
+        ticket.status = "Closed"
+        ticket.completed_at = now
+        unindex_ticket_deadline(ticket.id)
+        AUDIT_LOG.record("tickets", ticket.creator.guild, f"🔒 Ticket #{ticket.id} **{ticket.title}** closed for inactivity")
+        embed = discord.Embed(
+            title=f"🔒 Ticket Closed: #{ticket.id}",
+            description=f"**{ticket.title}** was closed automatically after {INACTIVITY_CLOSE_AFTER.days} days without activity.",
+            color=discord.Color.dark_grey()
+        )
+    
+    for user in {u.id: u for u in (ticket.assignee, ticket.creator) if u}.values():
+        try:
+            await user.send(embed=embed)
+        except discord.HTTPException:
+            pass
+
+@tasks.loop(minutes=30)
+async def check_reminders():
+    now = datetime.now()
+    for reminder in REMINDERS[:]:
+        if now >= reminder["time"]:
+            ticket = TICKETS_DB.get(reminder["ticket_id"])
+            if ticket:
+                user = bot.get_user(reminder["user_id"])
+                if user:
+                    embed = discord.Embed(
+                        title=f"⏰ Reminder: Ticket #{ticket.id}",
+                        description=f"**{ticket.title}**\n\n{reminder.get('note', 'No additional notes')}",
+                        color=discord.Color.gold()
+                    )
+                    embed.add_field(name="Status", value=ticket.status, inline=True)
+                    embed.add_field(name="Priority", value=ticket.priority, inline=True)
+                    embed.add_field(name="Deadline", value=ticket.deadline, inline=True)
+                    
+                    try:
+                        await user.send(embed=embed)
+                        REMINDERS.remove(reminder)
+                    except:
+                        pass
+
+class Tickets(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    async def cog_load(self):
+        DEADLINE_INDEX.callback = notify_deadline
+        INACTIVITY_INDEX.callback = check_inactivity
+        if self.bot.is_ready():
+            restore_saved_tickets()
+        start_when_ready(DEADLINE_INDEX.start, INACTIVITY_INDEX.start, check_reminders.start)
+    
+    async def cog_unload(self):
+        DEADLINE_INDEX.stop()
+        INACTIVITY_INDEX.stop()
+        check_reminders.cancel()
+    
+    @commands.Cog.listener()
+    async def on_members_chunked(self):
+        restore_saved_tickets()
+    
+    @commands.Cog.listener()
+    async def on_member_message(self, message: discord.Message):
+        # Attachments sent in reply to a ticket embed are added to that ticket
+        if not message.attachments or not message.reference:
+            return
+        
+        try:
+            replied_message = await message.channel.fetch_message(message.reference.message_id)
+            if replied_message.embeds and replied_message.embeds[0].title.startswith("🎫 Ticket #"):
+                ticket_id = int(replied_message.embeds[0].footer.text.split(": ")[1])
+                ticket = TICKETS_DB.get(ticket_id)
+                if ticket:
+                    ticket.attachments.extend([a.url for a in message.attachments])
+                    ticket.touch()
+                    
+                    embed = discord.Embed(
+                        description=f"📎 Added {len(message.attachments)} attachment(s) to ticket #{ticket_id}",
+                        color=discord.Color.green()
+                    )
+                    await message.reply(embed=embed, delete_after=5)
+                    
+                    await replied_message.edit(embed=ticket.to_embed())
+        except:
+            pass
+    
+    @commands.Cog.listener("on_interaction")
+    async def on_ticket_action(self, interaction: discord.Interaction):
+        if interaction.type != discord.InteractionType.component:
+            return
+        
+        parts = interaction.data.get("custom_id", "").split(":")
+        if len(parts) != 3 or parts[0] != TICKET_ACTION_PREFIX or not parts[2].isdigit():
+            return
+        
+        _, action, ticket_id = parts
+        if action not in TICKET_ACTION_NAMES:
+            return
+        await getattr(TicketActions(int(ticket_id)), action)(interaction)
+    
+    @app_commands.command(name="newticket", description="🎟️ Create a new premium support ticket")
+    async def create_ticket(self, interaction: discord.Interaction):
+        members = [m for m in interaction.guild.members if not m.bot]
+        if not members:
+            embed = discord.Embed(
+                description="❌ No team members available for assignment",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        await interaction.response.send_modal(TicketModal(members))
+    
+    @app_commands.command(name="ticket", description="🔍 View a specific ticket")
+    @app_commands.autocomplete(ticket_id=ticket_autocomplete)
+    async def view_ticket(self, interaction: discord.Interaction, ticket_id: int):
+        ticket = TICKETS_DB.get(ticket_id)
+        
+        if not ticket:
+            embed = discord.Embed(
+                description=f"❌ Ticket #{ticket_id} not found",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if interaction.user.id not in [ticket.assignee.id, ticket.creator.id]:
+            embed = discord.Embed(
+                description="🚫 You don't have permission to view this ticket",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        embed = ticket.to_embed()
+        view = ticket_actions_view(ticket_id)
+        await interaction.response.send_message(embed=embed, view=view)
+    
+    @app_commands.command(name="mytickets", description="📋 View all your assigned tickets")
+    async def my_tickets(self, interaction: discord.Interaction):
+        user_tickets = [
+            t for t in TICKETS_DB.values() 
+            if t.assignee.id == interaction.user.id or t.creator.id == interaction.user.id
+        ]
+        
+        if not user_tickets:
+            embed = discord.Embed(
+                description="📭 You have no assigned tickets",
+                color=discord.Color.blue()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        embeds = []
+        for i, ticket in enumerate(user_tickets[:10], 1):
+            embed = discord.Embed(
+                title=f"📋 Your Tickets ({i}/{len(user_tickets[:10])})",
+                color=discord.Color.blurple()
+            )
+            embed.add_field(
+                name=f"#{ticket.id} {STATUS_EMOJIS.get(ticket.status)} {ticket.title}",
+                value=f"**Priority:** {ticket.priority}\n**Deadline:** {ticket.deadline}",
+                inline=False
+            )
+            embeds.append(embed)
+        
+        await interaction.response.send_message(embeds=embeds, ephemeral=True)
+    
+    @app_commands.command(name="search", description="🔎 Search your tickets by content")
+    @app_commands.describe(
+        query="Words to look for in titles, descriptions and comments",
+        category="Only tickets in this category",
+        priority="Only tickets with this priority",
+        status="Only tickets with this status",
+        since="Created on or after (DD/MM/YYYY)",
+        until="Created on or before (DD/MM/YYYY)"
+    )
+    @app_commands.choices(
+        category=[app_commands.Choice(name=option.label, value=option.value) for option in CATEGORIES],
+        priority=[app_commands.Choice(name=option.label, value=option.value) for option in PRIORITY_OPTIONS],
+        status=[app_commands.Choice(name=f"{emoji} {status}", value=status) for status, emoji in STATUS_EMOJIS.items()]
+    )
+    async def search_tickets(
+        self,
+        interaction: discord.Interaction,
+        query: str,
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ):
+        try:
+            start = datetime.strptime(since, DEADLINE_FORMAT) if since else None
+            end = datetime.strptime(until, DEADLINE_FORMAT) + timedelta(days=1) if until else None
+        except ValueError:
+            embed = discord.Embed(
+                description="❌ Dates must be in DD/MM/YYYY format",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        admin = is_admin(interaction.user)
+        
+        def allowed(ticket_id: int) -> bool:
+            ticket = TICKETS_DB.get(ticket_id)
+            return bool(
+                ticket
+                and (admin or interaction.user.id in (ticket.assignee.id, ticket.creator.id))
+                and (not category or ticket.category.lower() == category.lower())
+                and (not priority or ticket.priority.lower() == priority.lower())
+                and (not status or ticket.status == status)
+                and (not start or ticket.created_at >= start)
+                and (not end or ticket.created_at < end)
+            )
+        
+        results = SEARCH_INDEX.search(query, allowed)
+        if not results:
+            embed = discord.Embed(
+                description=f"🔎 No tickets match **{query[:100]}**",
+                color=discord.Color.orange()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title=f"🔎 Results for \"{query[:100]}\"",
+            color=discord.Color.blurple()
+        )
+        for ticket_id, _ in results:
+            ticket = TICKETS_DB[ticket_id]
+            embed.add_field(
+                name=f"#{ticket.id} {STATUS_EMOJIS.get(ticket.status, '📌')} {ticket.title[:80]}",
+                value=f"{ticket.category} • {ticket.priority} • Created {ticket.created_at.strftime('%d %b %Y')}\n"
+                      f"{ticket.description[:100]}{'…' if len(ticket.description) > 100 else ''}",
+                inline=False
+            )
+        embed.set_footer(text="Open a result with /ticket")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Tickets(bot))
@@ -0,0 +1,240 @@
+import time
+from datetime import datetime, timedelta
+
+import discord
+from discord import app_commands, ui
+from discord.ext import commands, tasks
+
+from core import (
+    USER_STATS, award, bot, compute_salary, count_activity, db, format_amount, month_key,
+    monthly_counters, start_when_ready
+)
+from state.work_hours import (
+    ACTIVITY, VOICE_SESSIONS, WORK_HOURS, close_voice_session, credit_activity,
+    is_tracked_voice_channel, open_voice_session, reconcile_voice_sessions
+)
+
+class WorkHoursModal(ui.Modal, title="⏱️ Log Work Hours"):
+    date = ui.TextInput(
+        label="Date (DD/MM/YYYY)", 
+        placeholder="e.g., 14/06/2025",
+        style=discord.TextStyle.short,
+        required=True
+    )
+    start_time = ui.TextInput(
+        label="Start Time (HH:MM)", 
+        placeholder="e.g., 09:00",
+        style=discord.TextStyle.short,
+        required=True
+    )
+    end_time = ui.TextInput(
+        label="End Time (HH:MM)", 
+        placeholder="e.g., 17:30",
+        style=discord.TextStyle.short,
+        required=True
+    )
+    tasks = ui.TextInput(
+        label="Tasks Completed", 
+        placeholder="Describe what you worked on...",
+        style=discord.TextStyle.long,
+        required=False
+    )
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            # Validate date and times
+            work_date = datetime.strptime(str(self.date), "%d/%m/%Y").date()
+            start = datetime.strptime(str(self.start_time), "%H:%M").time()
+            end = datetime.strptime(str(self.end_time), "%H:%M").time()
+            
+            if end <= start:
+                raise ValueError("End time must be after start time")
+            
+            # Calculate hours worked
+            start_dt = datetime.combine(work_date, start)
+            end_dt = datetime.combine(work_date, end)
+            hours_worked = round((end_dt - start_dt).total_seconds() / 3600, 2)
+            
+            # Store work hours
+            user_id = str(interaction.user.id)
+            if user_id not in WORK_HOURS:
+                WORK_HOURS[user_id] = {}
+                
+            date_str = work_date.strftime("%Y-%m-%d")
+            WORK_HOURS[user_id][date_str] = {
+                "start": str(self.start_time),
+                "end": str(self.end_time),
+                "hours": hours_worked,
+                "tasks": str(self.tasks) if self.tasks else "No details provided"
+            }
+            
+            # Award coins for work hours
+            reward = award(user_id, coins=hours_worked, xp=hours_worked * 10)
+            coins_earned = reward["coins"]
+            if reward["levels"]:
+                level_up_msg = f"🎉 Level up! You're now level {USER_STATS[user_id]['level']}!"
+            else:
+                level_up_msg = ""
+            
+            embed = discord.Embed(
+                title="⏱️ Work Hours Logged",
+                description=f"Successfully recorded your work hours for {work_date.strftime('%d %b %Y')}",
+                color=discord.Color.green()
+            )
+            embed.add_field(name="Start Time", value=str(self.start_time), inline=True)
+            embed.add_field(name="End Time", value=str(self.end_time), inline=True)
+            embed.add_field(name="Total Hours", value=f"{hours_worked} hours", inline=True)
+            embed.add_field(name="Coins Earned", value=f"🪙 {coins_earned} Obiz Coins", inline=False)
+            if level_up_msg:
+                embed.add_field(name="Level Up!", value=level_up_msg, inline=False)
+            
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            
+        except ValueError as e:
+            embed = discord.Embed(
+                title="❌ Error Logging Hours",
+                description=str(e),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@tasks.loop(minutes=15)
+async def update_active_users():
+    # Presence changes keep ACTIVITY current, so this only settles accrued time
+    # and credits everyone who crossed an hour
+    await credit_activity()
+
+def seed_activity():
+    """Catch activity and voice tracking up with the gateway's current snapshot"""
+    for guild in bot.guilds:
+        for member in guild.members:
+            if not member.bot:
+                ACTIVITY.set_active(str(member.id), member.status != discord.Status.offline)
+    reconcile_voice_sessions()
+
+class WorkHours(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+    
+    async def cog_load(self):
+        # Presence and voice updates were missed while this extension was unloaded
+        if self.bot.is_ready():
+            seed_activity()
+        start_when_ready(update_active_users.start)
+    
+    async def cog_unload(self):
+        update_active_users.cancel()
+        # Pay out time accrued so far; on shutdown this is the last settle
+        await credit_activity()
+    
+    @commands.Cog.listener()
+    async def on_members_chunked(self):
+        seed_activity()
+    
+    @commands.Cog.listener()
+    async def on_member_message(self, message: discord.Message):
+        count_activity(str(message.author.id), "messages")
+    
+    @app_commands.command(name="loghours", description="⏱️ Log your work hours")
+    async def log_hours(self, interaction: discord.Interaction):
+        await interaction.response.send_modal(WorkHoursModal())
+    
+    @app_commands.command(name="workreport", description="📊 Show your work hours report")
+    async def work_report(self, interaction: discord.Interaction):
+        user_id = str(interaction.user.id)
+        if user_id not in WORK_HOURS or not WORK_HOURS[user_id]:
+            embed = discord.Embed(
+                description="📭 You have no logged work hours",
+                color=discord.Color.blue()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        total_hours = 0
+        embed = discord.Embed(
+            title=f"⏱️ Work Report for {interaction.user.display_name}",
+            color=discord.Color.gold()
+        )
+        
+        for date, entry in WORK_HOURS[user_id].items():
+            date_obj = datetime.strptime(date, "%Y-%m-%d")
+            embed.add_field(
+                name=f"📅 {date_obj.strftime('%d %b %Y')}",
+                value=f"⏰ {entry['start']} - {entry['end']} ({entry['hours']} hrs)\n📝 {entry['tasks']}",
+                inline=False
+            )
+            total_hours += entry['hours']
+        
+        embed.set_footer(text=f"Total Hours: {total_hours}")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        if after.bot or before.status == after.status:
+            return
+        ACTIVITY.set_active(str(after.id), after.status != discord.Status.offline)
+    
+    @app_commands.command(name="salary", description="💼 View or claim your monthly activity salary")
+    @app_commands.describe(action="View this month's progress or claim last month's salary")
+    @app_commands.choices(action=[
+        app_commands.Choice(name="View", value="view"),
+        app_commands.Choice(name="Claim", value="claim")
+    ])
+    async def salary(self, interaction: discord.Interaction, action: str = "view"):
+        user_id = str(interaction.user.id)
+        now = datetime.now()
+        
+        if action == "claim":
+            last_month = month_key(now.replace(day=1) - timedelta(days=1))
+            if db.execute("SELECT 1 FROM salary_claims WHERE user_id = ? AND month = ?", (user_id, last_month)).fetchone():
+                embed = discord.Embed(
+                    title="⏳ Already Claimed",
+                    description=f"You've already claimed your salary for {last_month}",
+                    color=discord.Color.orange()
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+            
+            counters = monthly_counters(user_id, last_month)
+            amount = compute_salary(counters)
+            with db:
+                db.execute(
+                    "INSERT INTO salary_claims (user_id, month, amount, claimed_at) VALUES (?, ?, ?, ?)",
+                    (user_id, last_month, amount, now.isoformat())
+                )
+            reward = award(user_id, coins=amount)
+            
+            embed = discord.Embed(
+                title=f"💼 Salary for {last_month} Claimed!",
+                description=f"You've been paid 🪙 {format_amount(reward['coins'])}",
+                color=discord.Color.green()
+            )
+            if reward["multiplier"] > 1:
+                embed.add_field(name="Bonus", value=f"🎉 {reward['multiplier']:g}x Multiplier!", inline=False)
+        else:
+            counters = monthly_counters(user_id, month_key(now))
+            embed = discord.Embed(
+                title=f"💼 Salary Progress for {month_key(now)}",
+                description=f"Estimated salary: 🪙 {compute_salary(counters):.2f}\nClaim it with `/salary claim` next month!",
+                color=discord.Color.blurple()
+            )
+        
+        embed.add_field(name="💬 Messages", value=f"{counters['messages']:g}", inline=True)
+        embed.add_field(name="✅ Tickets Resolved", value=f"{counters['tickets_resolved']:g}", inline=True)
+        embed.add_field(name="🎙️ Voice Time", value=f"{counters['voice_seconds'] / 3600:.1f} hrs", inline=True)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+        if member.bot or before.channel == after.channel:
+            return
+        
+        now = time.time()
+        user_id = str(member.id)
+        if user_id in VOICE_SESSIONS:
+            close_voice_session(user_id, now)
+        if is_tracked_voice_channel(after.channel):
+            open_voice_session(user_id, after.channel, now)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(WorkHours(bot))
@@ -0,0 +1,875 @@
+"""Shared state and models for the bot and its extensions.
+
+The extensions in cogs/ hold the commands, views, listeners and loops and
+can be reloaded while the bot runs. Everything that has to outlive a
+reload lives in modules that are only ever imported once: this one holds
+what every extension needs (the bot itself, the database, the economy,
+moderation and guild settings), and each subsystem's own state lives in
+state/, imported only by the extensions that use it.
+"""
+import discord
+from discord.ext import commands, tasks
+from discord import app_commands
+from datetime import datetime, timedelta
+import os
+import asyncio
+from typing import Dict, Optional, Union
+import math
+import heapq
+import itertools
+import bisect
+import logging
+import logging.handlers
+import json
+import time
+import sqlite3
+import collections
+
+# Load environment variables
+DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
+WELCOME_CHANNEL_ID = int(os.getenv("WELCOME_CHANNEL_ID", 0))
+ADMIN_ROLE_ID = int(os.getenv("ADMIN_ROLE_ID", 0))
+ADMIN_LOG_CHANNEL_ID = int(os.getenv("ADMIN_LOG_CHANNEL_ID", 0))
+
+# Initialize bot with premium intents
+intents = discord.Intents.default()
+intents.message_content = True
+intents.members = True
+intents.guilds = True
+intents.presences = True
+
+# Set once a shutdown begins; new slash commands are turned away while state is saved
+SHUTTING_DOWN = asyncio.Event()
+BUSY_CHECKS = []  # Callables that return True while a subsystem still has work in flight, for shutdown to wait on
+
+class ObizTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if not SHUTTING_DOWN.is_set():
+            return True
+        if interaction.type is discord.InteractionType.application_command:
+            await interaction.response.send_message("🔄 The bot is restarting, please try again in a few seconds.", ephemeral=True)
+        return False
+
+# Member lists are fetched in the background after on_ready rather than holding it up
+bot = commands.Bot(command_prefix="!", intents=intents, help_command=None, tree_cls=ObizTree, chunk_guilds_at_startup=False)
+log = logging.getLogger("obiz")
+
+def start_when_ready(*starters):
+    """Call each of ``starters`` once the gateway cache is ready, or right away if it already is"""
+    async def run():
+        await bot.wait_until_ready()
+        for start in starters:
+            start()
+    asyncio.create_task(run())
+
+# On-disk storage for data that grows without bound (counters, history, logs)
+DATABASE_PATH = os.getenv("DATABASE_PATH", "work_tracker.db")
+db = sqlite3.connect(DATABASE_PATH)
+db.execute("CREATE TABLE IF NOT EXISTS bot_meta (key TEXT PRIMARY KEY, value TEXT)")
+
+# Shutdown snapshots
+SNAPSHOT_STATE = {}  # Format: {name: (state, dump)} saved on shutdown and restored when registered
+
+db.execute("CREATE TABLE IF NOT EXISTS state_snapshots (name TEXT PRIMARY KEY, data TEXT)")
+db.commit()
+
+def encode_snapshot(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Can't snapshot {type(value).__name__}")
+
+def decode_snapshot(obj: dict):
+    if obj.keys() == {"__datetime__"}:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+def snapshot(name: str, state, dump=None, restore=None):
+    """Register ``state`` to be saved on shutdown, restoring its last snapshot into it first.
+    
+    Dicts and lists are saved as they are and refilled in place. Anything
+    else passes ``dump(state)`` to turn it into plain data and
+    ``restore(state, data)`` to load that data back.
+    """
+    row = db.execute("SELECT data FROM state_snapshots WHERE name = ?", (name,)).fetchone()
+    if row:
+        value = json.loads(row[0], object_hook=decode_snapshot)
+        if restore:
+            restore(state, value)
+        elif isinstance(state, dict):
+            state.update(value)
+        else:
+            state[:] = value
+    SNAPSHOT_STATE[name] = (state, dump)
+    return state
+
+def save_state():
+    # Subsystems whose extensions aren't loaded never register, so their last snapshot is kept as is
+    with db:
+        db.executemany(
+            "INSERT OR REPLACE INTO state_snapshots (name, data) VALUES (?, ?)",
+            [
+                (name, json.dumps(dump(state) if dump else state, default=encode_snapshot))
+                for name, (state, dump) in SNAPSHOT_STATE.items()
+            ]
+        )
+
+# Database simulation (replace with real DB in production)
+USER_STATS = snapshot("user_stats", {})  # Format: {user_id: {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0}}
+PENDING_REWARDS = []  # Queued (user_id, coins, xp) awards, credited in batches by flush_rewards
+GAMBLING_GAMES = {}  # Track active gambling games: {user_id: game name} while a game is in flight
+BUSY_CHECKS.append(lambda: bool(GAMBLING_GAMES))
+EVENT = None  # Current active event
+QUOTES = [
+    "Every idea counts, every second builds value. Welcome to SARVAX.",
+    "Greatness starts with a single step. Welcome aboard!",
+    "Your potential is limitless. Let's build something amazing!",
+    "Innovation begins here. Welcome to the team!",
+    "Success is a team sport. Glad you're on our side!"
+]
+
+# Shop items
+SHOP_ITEMS = {
+    "Custom Role": {"price": 5000, "description": "Get your own custom role with unique color"},
+    "VIP Perks": {"price": 3000, "description": "Exclusive VIP channel access, perks and +25% XP"},
+    "Priority Support": {"price": 2000, "description": "Jump to the front of support queues"},
+    "Custom Emoji": {"price": 8000, "description": "Add your own custom emoji to the server"},
+    "Double Coins (1 day)": {"price": 1500, "description": "Earn double coins for 24 hours"},
+    "Pet Treats (3 days)": {"price": 1000, "description": "Your pet gains double XP from feeding for 3 days"}
+}
+
+# Badges
+BADGES = {
+    "Early Adopter": "🥇",
+    "Coin Millionaire": "💰",
+    "Task Master": "✅",
+    "Legendary Worker": "🏆",
+    "Gambling King": "🎰"
+}
+
+class DeadlineScheduler:
+    """Fire an async callback for each key when its deadline is reached.
+
+    Deadlines live in a heap drained by one sleeping task, so scheduling,
+    rescheduling and cancelling are O(log n) and nothing is ever scanned.
+    Rescheduling or cancelling leaves the old heap entry behind; it is
+    recognised as stale and dropped when it reaches the top.
+    """
+
+    MAX_SLEEP = 3600  # Re-check the clock at least hourly
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self._heap = []
+        self._entries = {}  # key -> (when, seq) of the live heap entry
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def when(self, key) -> Optional[datetime]:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def schedule(self, key, when: datetime):
+        seq = next(self._seq)
+        self._entries[key] = (when, seq)
+        heapq.heappush(self._heap, (when, seq, key))
+        if self._heap[0][1] == seq:
+            self._wakeup.set()
+
+    def cancel(self, key):
+        self._entries.pop(key, None)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Stop firing callbacks; pending deadlines are kept for the next ``start``"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _is_live(self, when: datetime, seq: int, key) -> bool:
+        return self._entries.get(key) == (when, seq)
+
+    async def _run(self):
+        while True:
+            while self._heap and not self._is_live(*self._heap[0]):
+                heapq.heappop(self._heap)
+            
+            delay = self.MAX_SLEEP
+            if self._heap:
+                delay = min(delay, (self._heap[0][0] - datetime.now()).total_seconds())
+            
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            when, seq, key = heapq.heappop(self._heap)
+            del self._entries[key]
+            try:
+                await self.callback(key, when)
+            except Exception:
+                log.exception("Scheduled callback failed for %r", key)
+
+# Throttling: (burst capacity, tokens refilled per second)
+RATE_LIMITS = {
+    "coinflip": (3, 1 / 10),
+    "dice": (3, 1 / 10),
+    "daily": (2, 1 / 30),
+    "transfer": (5, 1 / 6),
+    "jackpot": (3, 1 / 20),
+    "invest": (5, 1 / 6),
+    "loan": (3, 1 / 30),
+    "bid": (5, 1 / 2),
+    "askai": (3, 1 / 20),
+    "trivia": (3, 1 / 20),
+    "feedpet": (3, 1 / 60),
+    "wordle": (3, 1 / 600)  # New games only; guesses in a running game aren't limited
+}
+GUILD_RATE_LIMIT = (60, 2)  # Economy and gambling commands per guild
+MAX_GAMES_IN_FLIGHT = 200  # Shed new games beyond this many running at once
+
+class TokenBucket:
+    """Token buckets for many keys, refilled lazily on access.
+
+    Each key only stores ``(tokens, last_refill)``; there are no timers.
+    A bucket that has refilled to capacity is indistinguishable from a
+    missing one, so idle keys are pruned whenever the table doubles.
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self._buckets = {}
+        self._prune_at = 1024
+
+    def take(self, key, cost: float = 1) -> float:
+        """Spend ``cost`` tokens; return 0 on success, else seconds until allowed"""
+        now = time.monotonic()
+        tokens, stamp = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - stamp) * self.rate)
+        
+        if tokens >= cost:
+            self._buckets[key] = (tokens - cost, now)
+            retry_after = 0
+        else:
+            self._buckets[key] = (tokens, now)
+            retry_after = (cost - tokens) / self.rate
+        
+        if len(self._buckets) >= self._prune_at:
+            self._prune(now)
+        return retry_after
+
+    def _prune(self, now: float):
+        full_after = self.capacity / self.rate
+        self._buckets = {
+            key: state for key, state in self._buckets.items()
+            if now - state[1] < full_after
+        }
+        self._prune_at = max(1024, 2 * len(self._buckets))
+
+USER_BUCKETS = {action: TokenBucket(*limit) for action, limit in RATE_LIMITS.items()}
+GUILD_BUCKET = TokenBucket(*GUILD_RATE_LIMIT)
+
+async def throttle(interaction: discord.Interaction, action: str) -> bool:
+    """Check rate limits for an economy action; reply and return False if it must be refused.
+
+    Refusals are plain ephemeral text so that shedding load stays cheap.
+    """
+    if action in ("coinflip", "dice") and len(GAMBLING_GAMES) >= MAX_GAMES_IN_FLIGHT:
+        await interaction.response.send_message("🚧 The casino is packed right now, please try again in a moment.", ephemeral=True)
+        return False
+    
+    if action in ("coinflip", "dice", "jackpot") and interaction.guild_id and not GUILD_CONFIGS.get(interaction.guild_id).settings["gambling_enabled"]:
+        await interaction.response.send_message("🎰 Gambling is disabled on this server.", ephemeral=True)
+        return False
+    
+    if interaction.guild_id and GUILD_BUCKET.take(interaction.guild_id):
+        await interaction.response.send_message("🚧 The server is busy, please try again in a moment.", ephemeral=True)
+        return False
+    
+    retry_after = USER_BUCKETS[action].take(interaction.user.id)
+    if retry_after:
+        await interaction.response.send_message(f"⏳ Slow down! Try again in {math.ceil(retry_after)}s.", ephemeral=True)
+        return False
+    return True
+
+def start_game(user_id: str, game: str) -> bool:
+    """Register an in-flight game; False if the user already has one running"""
+    if user_id in GAMBLING_GAMES:
+        return False
+    GAMBLING_GAMES[user_id] = game
+    return True
+
+def finish_game(user_id: str):
+    GAMBLING_GAMES.pop(user_id, None)
+
+async def send_game_in_progress(interaction: discord.Interaction):
+    await interaction.response.send_message(
+        f"🎲 Finish your current {GAMBLING_GAMES.get(str(interaction.user.id), 'game')} first!",
+        ephemeral=True
+    )
+
+# Rewards
+XP_PER_LEVEL = 100  # Reaching level n + 1 takes n * XP_PER_LEVEL XP
+MAX_LEVEL = 1000
+# Total XP at the start of each level, LEVEL_XP_THRESHOLDS[level - 1]
+LEVEL_XP_THRESHOLDS = [XP_PER_LEVEL * (level - 1) * level // 2 for level in range(1, MAX_LEVEL + 1)]
+BUFF_KINDS = ("coins", "xp", "pet_xp")
+ITEM_EFFECTS = {  # Shop item -> (multipliers while held, how long it lasts; None for good)
+    "VIP Perks": ({"xp": 1.25}, None),
+    "Double Coins (1 day)": ({"coins": 2}, timedelta(days=1)),
+    "Pet Treats (3 days)": ({"pet_xp": 2}, timedelta(days=3))
+}
+EVENT_EFFECTS = {"Double Coins": {"coins": 2}}  # Event type -> multipliers for everyone while it runs
+EVENT_GENERATION = 0  # Bumped whenever EVENT changes, invalidating cached multipliers
+
+db.execute("""CREATE TABLE IF NOT EXISTS inventory (
+    user_id TEXT, item TEXT, acquired_at TEXT, expires_at TEXT,
+    PRIMARY KEY (user_id, item)
+)""")
+db.commit()
+
+def new_user_stats() -> dict:
+    return {"coins": 1000, "streak": 0, "last_daily": None, "level": 1, "xp": 0, "badges": []}
+
+def get_user_stats(user_id: str) -> dict:
+    if user_id not in USER_STATS:
+        USER_STATS[user_id] = new_user_stats()
+    return USER_STATS[user_id]
+
+def set_event(event: Optional[dict]):
+    global EVENT, EVENT_GENERATION
+    EVENT = event
+    EVENT_GENERATION += 1
+
+def active_event() -> Optional[dict]:
+    """Return the running event, ending it once its end time has passed"""
+    if EVENT and datetime.now() >= EVENT["end_time"]:
+        set_event(None)
+    return EVENT
+
+class Inventory:
+    """Every user's items, with their buffs folded into a cached multiplier vector.
+
+    A user's multipliers are rebuilt only when their items change, one of
+    them expires or the event changes, so reward paths read a cached
+    dict instead of walking the inventory. Items are stored in sqlite;
+    buying a timed item you already hold extends it.
+    """
+
+    def __init__(self):
+        self.items = {}  # user_id -> {item: expires_at or None}
+        self._multipliers = {}  # user_id -> (event generation, valid until, {buff: multiplier})
+
+    def load(self):
+        for user_id, item, _, expires_at in db.execute("SELECT * FROM inventory").fetchall():
+            self.items.setdefault(user_id, {})[item] = datetime.fromisoformat(expires_at) if expires_at else None
+
+    def add(self, user_id: str, item: str) -> Optional[datetime]:
+        """Give a user an item; returns when it expires, if it does"""
+        now = datetime.now()
+        held = self.items.setdefault(user_id, {})
+        duration = ITEM_EFFECTS.get(item, ({}, None))[1]
+        expires_at = None
+        if duration:
+            current = held.get(item)
+            expires_at = max(current or now, now) + duration
+
+        held[item] = expires_at
+        self._multipliers.pop(user_id, None)
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO inventory (user_id, item, acquired_at, expires_at) VALUES (?, ?, ?, ?)",
+                (user_id, item, now.isoformat(), expires_at.isoformat() if expires_at else None)
+            )
+        return expires_at
+
+    def held(self, user_id: str) -> Dict[str, Optional[datetime]]:
+        """The user's unexpired items, dropping any that have run out"""
+        held = self.items.get(user_id, {})
+        now = datetime.now()
+        expired = [item for item, expires_at in held.items() if expires_at and expires_at <= now]
+        if expired:
+            for item in expired:
+                del held[item]
+            with db:
+                db.executemany("DELETE FROM inventory WHERE user_id = ? AND item = ?", [(user_id, item) for item in expired])
+        return held
+
+    def multipliers(self, user_id: str) -> Dict[str, float]:
+        now = datetime.now()
+        event = active_event()
+        cached = self._multipliers.get(user_id)
+        if cached and cached[0] == EVENT_GENERATION and now < cached[1]:
+            return cached[2]
+
+        vector = dict.fromkeys(BUFF_KINDS, 1.0)
+        valid_until = datetime.max
+        if event:
+            for kind, factor in EVENT_EFFECTS.get(event["type"], {}).items():
+                vector[kind] *= factor
+            valid_until = event["end_time"]
+        for item, expires_at in self.held(user_id).items():
+            for kind, factor in ITEM_EFFECTS.get(item, ({}, None))[0].items():
+                vector[kind] *= factor
+            if expires_at:
+                valid_until = min(valid_until, expires_at)
+
+        self._multipliers[user_id] = (EVENT_GENERATION, valid_until, vector)
+        return vector
+
+INVENTORY = Inventory()
+INVENTORY.load()
+
+def add_xp(stats: dict, xp: float) -> int:
+    """Add XP, applying any number of level-ups at once; returns levels gained"""
+    total = LEVEL_XP_THRESHOLDS[stats["level"] - 1] + stats["xp"] + xp
+    level = min(bisect.bisect_right(LEVEL_XP_THRESHOLDS, total), MAX_LEVEL)
+    gained = level - stats["level"]
+    stats["level"] = level
+    stats["xp"] = total - LEVEL_XP_THRESHOLDS[level - 1]
+    return gained
+
+def apply_rewards(awards) -> Dict[str, dict]:
+    """Credit a batch of ``(user_id, coins, xp)`` awards.
+
+    Awards are summed per user first, so multipliers and level-ups are
+    resolved once per user however many awards they received. Returns
+    ``{user_id: {"coins", "xp", "multiplier", "levels"}}`` for the users credited.
+    """
+    totals = {}
+    for user_id, coins, xp in awards:
+        total = totals.setdefault(user_id, [0, 0])
+        total[0] += coins
+        total[1] += xp
+    
+    results = {}
+    for user_id, (coins, xp) in totals.items():
+        stats = get_user_stats(user_id)
+        multipliers = INVENTORY.multipliers(user_id)
+        multiplier = multipliers["coins"]
+        # Unbuffed awards keep their exact amounts, so whole balances stay whole
+        if multiplier != 1:
+            coins = round(coins * multiplier, 2)
+        if multipliers["xp"] != 1:
+            xp = round(xp * multipliers["xp"], 2)
+        stats["coins"] += coins
+        results[user_id] = {
+            "coins": coins,
+            "xp": xp,
+            "multiplier": multiplier,
+            "levels": add_xp(stats, xp) if xp else 0
+        }
+    return results
+
+def format_amount(amount: float) -> str:
+    """Show a balance whole when it is, otherwise to the cent"""
+    return f"{amount:.2f}" if amount % 1 else f"{amount:.0f}"
+
+def award(user_id: str, coins: float = 0, xp: float = 0) -> dict:
+    """Credit a single award immediately, for commands that show the result"""
+    return apply_rewards([(user_id, coins, xp)])[user_id]
+
+def queue_reward(user_id: str, coins: float = 0, xp: float = 0):
+    """Queue an award for the next flush_rewards batch"""
+    PENDING_REWARDS.append((user_id, coins, xp))
+
+def flush_pending_rewards():
+    if PENDING_REWARDS:
+        batch = PENDING_REWARDS.copy()
+        PENDING_REWARDS.clear()
+        apply_rewards(batch)
+
+# Run from core rather than an extension, since every subsystem queues rewards
+@tasks.loop(seconds=30)
+async def flush_rewards():
+    flush_pending_rewards()
+
+# Activity counters and monthly salary
+SALARY_RATES = {  # Coins per unit of each monthly counter
+    "messages": 0.5,
+    "tickets_resolved": 50,
+    "voice_seconds": 20 / 3600
+}
+SALARY_CAPS = {"messages": 3000}  # Units counted per month, to keep spam from paying
+PENDING_COUNTERS = {}  # Format: {(user_id, month, kind): delta} not yet flushed to the database
+
+db.execute("""CREATE TABLE IF NOT EXISTS activity_counters (
+    user_id TEXT, month TEXT, kind TEXT, amount REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, month, kind)
+)""")
+db.execute("""CREATE TABLE IF NOT EXISTS salary_claims (
+    user_id TEXT, month TEXT, amount REAL, claimed_at TEXT,
+    PRIMARY KEY (user_id, month)
+)""")
+
+def month_key(when: Optional[datetime] = None) -> str:
+    return (when or datetime.now()).strftime("%Y-%m")
+
+def count_activity(user_id: str, kind: str, amount: float = 1):
+    """O(1) bump of a user's counter for this month; persisted by flush_counters"""
+    key = (user_id, month_key(), kind)
+    PENDING_COUNTERS[key] = PENDING_COUNTERS.get(key, 0) + amount
+
+def monthly_counters(user_id: str, month: str) -> Dict[str, float]:
+    """Stored totals plus unflushed deltas for one user and month"""
+    totals = dict.fromkeys(SALARY_RATES, 0)
+    for kind, amount in db.execute(
+        "SELECT kind, amount FROM activity_counters WHERE user_id = ? AND month = ?", (user_id, month)
+    ):
+        totals[kind] = amount
+    for kind in SALARY_RATES:
+        totals[kind] += PENDING_COUNTERS.get((user_id, month, kind), 0)
+    return totals
+
+def compute_salary(counters: Dict[str, float]) -> float:
+    return round(sum(
+        min(counters.get(kind, 0), SALARY_CAPS.get(kind, math.inf)) * rate
+        for kind, rate in SALARY_RATES.items()
+    ), 2)
+
+def flush_activity_counters():
+    batch = dict(PENDING_COUNTERS)
+    PENDING_COUNTERS.clear()
+    with db:
+        db.executemany(
+            """INSERT INTO activity_counters (user_id, month, kind, amount) VALUES (?, ?, ?, ?)
+            ON CONFLICT (user_id, month, kind) DO UPDATE SET amount = amount + excluded.amount""",
+            [(user_id, month, kind, amount) for (user_id, month, kind), amount in batch.items()]
+        )
+        # Lets the next start know when this process was last alive
+        db.execute("INSERT OR REPLACE INTO bot_meta (key, value) VALUES ('heartbeat', ?)", (str(time.time()),))
+
+@tasks.loop(minutes=1)
+async def flush_counters():
+    flush_activity_counters()
+
+# Spam detection
+SPAM_WINDOW = 10  # Seconds covered by the rate check
+SPAM_MAX_MESSAGES = 8  # Messages a member may send per window
+SPAM_DUPLICATE_LIMIT = 4  # Copies of one message by one member within two windows
+SPAM_DUPLICATE_HISTORY = 16  # Recent messages per member compared for duplicates
+SPAM_MIN_DUPLICATE_LENGTH = 12  # Shorter messages ("gm", "lol") are never treated as duplicates
+SPAM_TRACKED_MEMBERS = 50000  # Rate windows kept; least recently active are evicted first
+SPAM_TIMEOUT = timedelta(minutes=10)
+SPAM_STRIKES_TO_KICK = 3
+SPAM_STRIKE_DECAY = timedelta(days=1)  # One strike is forgiven per day without new ones
+MODERATION_QUEUE = asyncio.Queue(maxsize=1000)
+BUSY_CHECKS.append(lambda: not MODERATION_QUEUE.empty())
+
+class SpamTracker:
+    """Sliding-window rate and duplicate checks for the on_message hot path.
+    
+    Each member keeps a deque of their last SPAM_MAX_MESSAGES timestamps
+    and one of hashes of their last SPAM_DUPLICATE_HISTORY messages, so a
+    check is O(1), duplicates are counted exactly however busy the guild
+    is, and members posting the same greeting never add up to spam. The
+    member and strike tables are LRUs capped at SPAM_TRACKED_MEMBERS,
+    keeping memory bounded during a raid.
+    """
+    
+    def __init__(self):
+        self.windows = collections.OrderedDict()  # (guild_id, user_id) -> (deque of timestamps, deque of (timestamp, content hash))
+        self.strikes = collections.OrderedDict()  # (guild_id, user_id) -> (strikes, monotonic time of the last one)
+    
+    def check(self, message: discord.Message) -> Optional[str]:
+        """Return why the message is spam, or None"""
+        now = time.monotonic()
+        key = (message.guild.id, message.author.id)
+        
+        entry = self.windows.get(key)
+        if entry is None:
+            entry = self.windows[key] = (collections.deque(maxlen=SPAM_MAX_MESSAGES), collections.deque(maxlen=SPAM_DUPLICATE_HISTORY))
+            if len(self.windows) > SPAM_TRACKED_MEMBERS:
+                self.windows.popitem(last=False)
+        else:
+            self.windows.move_to_end(key)
+        window, recent = entry
+        window.append(now)
+        if len(window) == SPAM_MAX_MESSAGES and now - window[0] < SPAM_WINDOW:
+            return f"sent {SPAM_MAX_MESSAGES} messages in under {SPAM_WINDOW}s"
+        
+        content = " ".join(message.content.lower().split())
+        if len(content) >= SPAM_MIN_DUPLICATE_LENGTH:
+            digest = hash(content)
+            copies = 1 + sum(1 for sent_at, seen in recent if seen == digest and now - sent_at < 2 * SPAM_WINDOW)
+            recent.append((now, digest))
+            if copies >= SPAM_DUPLICATE_LIMIT:
+                return f"repeated the same message {SPAM_DUPLICATE_LIMIT} times"
+        return None
+    
+    def flag(self, message: discord.Message) -> Optional[str]:
+        """Record a strike and return the action to take, or None if one is already under way"""
+        now = time.monotonic()
+        key = (message.guild.id, message.author.id)
+        strikes = 0
+        if key in self.strikes:
+            strikes, last = self.strikes[key]
+            if now - last < SPAM_TIMEOUT.total_seconds():
+                return None
+            strikes = max(0, strikes - int((now - last) // SPAM_STRIKE_DECAY.total_seconds()))
+        
+        strikes += 1
+        self.strikes[key] = (strikes, now)
+        self.strikes.move_to_end(key)
+        if len(self.strikes) > SPAM_TRACKED_MEMBERS:
+            self.strikes.popitem(last=False)
+        return "kick" if strikes >= SPAM_STRIKES_TO_KICK else "timeout"
+
+SPAM_TRACKER = SpamTracker()
+
+def is_moderator(member: discord.Member) -> bool:
+    return member.guild_permissions.manage_messages or GUILD_CONFIGS.get(member.guild.id).is_moderator(member)
+
+async def handle_spam(message: discord.Message) -> bool:
+    """Check a guild message for spam, queueing moderation if needed; True if it was spam"""
+    if not isinstance(message.author, discord.Member) or is_moderator(message.author):
+        return False
+    
+    reason = SPAM_TRACKER.check(message)
+    if not reason:
+        return False
+    
+    action = SPAM_TRACKER.flag(message)
+    if action:
+        try:
+            MODERATION_QUEUE.put_nowait((action, message.author, reason))
+            AUDIT_LOG.record("moderation", message.guild, f"🚩 {message.author.mention} {reason} → queued {action}")
+        except asyncio.QueueFull:
+            AUDIT_LOG.record("moderation", message.guild, f"⚠️ Moderation queue full, dropped {action} for {message.author.mention}")
+    return True
+
+@tasks.loop(seconds=0)
+async def moderation_worker():
+    action, member, reason = await MODERATION_QUEUE.get()
+    try:
+        if action == "kick":
+            await member.kick(reason=f"Spam: {reason}")
+            AUDIT_LOG.record("moderation", member.guild, f"👢 Kicked {member.mention} after {SPAM_STRIKES_TO_KICK} spam strikes")
+        else:
+            await member.timeout(SPAM_TIMEOUT, reason=f"Spam: {reason}")
+            AUDIT_LOG.record("moderation", member.guild, f"🔇 Timed out {member.mention} for {int(SPAM_TIMEOUT.total_seconds() // 60)} minutes")
+    except discord.HTTPException as e:
+        AUDIT_LOG.record("moderation", member.guild, f"❌ Couldn't {action} {member.mention}: {e}")
+
+# Audit log
+AUDIT_LOG_PATH = os.getenv("AUDIT_LOG_PATH", "audit.log")
+AUDIT_LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate the file at 5 MB...
+AUDIT_LOG_BACKUPS = 5  # ...keeping this many old files
+AUDIT_FLUSH_INTERVAL = 15  # Seconds between batched posts to the log channels
+TICKET_LOG_CHANNEL = "ticket-logs"
+
+class AuditLog:
+    """Moderation and ticket events, batched on their way to disk and Discord.
+    
+    ``record`` only appends to an in-memory queue. Each ``flush`` writes
+    the queued events to an append-only, size-rotated JSON-lines file, then
+    posts them to each destination channel as a few multi-line embeds.
+    Repeats of the same event in one batch are coalesced into one line.
+    """
+    
+    def __init__(self, path: str):
+        self.queue = []  # (timestamp, kind, guild_id, text)
+        self.file = logging.getLogger("obiz.audit")
+        self.file.propagate = False
+        self.file.setLevel(logging.INFO)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=AUDIT_LOG_MAX_BYTES, backupCount=AUDIT_LOG_BACKUPS, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.file.addHandler(handler)
+    
+    def record(self, kind: str, guild: Optional[discord.Guild], text: str):
+        """Queue an event; ``kind`` is "tickets" or "moderation" and picks the channel"""
+        self.queue.append((datetime.now(), kind, guild.id if guild else None, text))
+    
+    def destination(self, kind: str, guild_id: Optional[int]) -> Optional[discord.abc.Messageable]:
+        if not guild_id:
+            return bot.get_channel(ADMIN_LOG_CHANNEL_ID)
+        config = GUILD_CONFIGS.get(guild_id)
+        return (kind == "tickets" and config.ticket_log_channel()) or config.admin_log_channel()
+    
+    async def flush(self):
+        if not self.queue:
+            return
+        
+        batch, self.queue = self.queue, []
+        for stamp, kind, guild_id, text in batch:
+            self.file.info(json.dumps({"time": stamp.isoformat(), "kind": kind, "guild": guild_id, "event": text}))
+        
+        # Coalesce per destination, keeping the first time each event was seen
+        grouped = {}
+        for stamp, kind, guild_id, text in batch:
+            events = grouped.setdefault((kind, guild_id), {})
+            if text in events:
+                events[text][1] += 1
+            else:
+                events[text] = [stamp, 1]
+        
+        for (kind, guild_id), events in grouped.items():
+            channel = self.destination(kind, guild_id)
+            if not channel:
+                continue
+            
+            lines = [
+                f"`{stamp.strftime('%H:%M:%S')}` {text}" + (f" (×{count})" if count > 1 else "")
+                for text, (stamp, count) in events.items()
+            ]
+            title = "🛡️ Moderation Log" if kind == "moderation" else "🎫 Ticket Log"
+            color = discord.Color.dark_red() if kind == "moderation" else discord.Color.blurple()
+            description = ""
+            for line in lines:
+                if len(description) + len(line) + 1 > 4000:
+                    await self._send(channel, discord.Embed(title=title, description=description, color=color))
+                    description = ""
+                description += line + "\n"
+            await self._send(channel, discord.Embed(title=title, description=description, color=color))
+    
+    async def _send(self, channel: discord.abc.Messageable, embed: discord.Embed):
+        try:
+            await channel.send(embed=embed)
+        except discord.HTTPException:
+            pass
+
+AUDIT_LOG = AuditLog(AUDIT_LOG_PATH)
+
+@tasks.loop(seconds=AUDIT_FLUSH_INTERVAL)
+async def flush_audit_log():
+    await AUDIT_LOG.flush()
+
+# Per-guild configuration
+TRAINEE_ROLE_NAME = "Trainee"
+GUILD_CONFIG_DEFAULTS = {  # Unset keys fall back to these; the env vars seed single-server setups
+    "welcome_channel_id": WELCOME_CHANNEL_ID,
+    "admin_role_ids": [ADMIN_ROLE_ID] if ADMIN_ROLE_ID else [],
+    "mod_role_ids": [],
+    "admin_log_channel_id": ADMIN_LOG_CHANNEL_ID,
+    "ticket_log_channel_id": 0,  # 0 looks for a channel named TICKET_LOG_CHANNEL
+    "trainee_role_id": 0,  # 0 looks for a role named TRAINEE_ROLE_NAME
+    "gambling_enabled": True
+}
+
+db.execute("CREATE TABLE IF NOT EXISTS guild_config (guild_id INTEGER PRIMARY KEY, settings TEXT)")
+db.commit()
+
+class GuildConfig:
+    """One guild's settings, with its roles and channels resolved once and cached.
+    
+    Role sets are kept as Python sets so permission checks are lookups,
+    and resolved objects (including the by-name fallbacks) are reused
+    until a role or channel event in the guild calls ``invalidate``.
+    """
+    
+    def __init__(self, guild_id: int, settings: Optional[dict] = None):
+        self.guild_id = guild_id
+        self.settings = {**GUILD_CONFIG_DEFAULTS, **(settings or {})}
+        self.admin_role_ids = set(self.settings["admin_role_ids"])
+        self.mod_role_ids = set(self.settings["mod_role_ids"])
+        self._resolved = {}
+    
+    def invalidate(self):
+        self._resolved.clear()
+    
+    def set(self, key: str, value):
+        self.settings[key] = value
+        self.admin_role_ids = set(self.settings["admin_role_ids"])
+        self.mod_role_ids = set(self.settings["mod_role_ids"])
+        self.invalidate()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO guild_config (guild_id, settings) VALUES (?, ?)",
+                (self.guild_id, json.dumps(self.settings))
+            )
+    
+    def _resolve(self, key: str, lookup):
+        if key not in self._resolved:
+            guild = bot.get_guild(self.guild_id)
+            self._resolved[key] = lookup(guild) if guild else None
+        return self._resolved[key]
+    
+    def is_admin(self, member: discord.Member) -> bool:
+        return any(member.get_role(role_id) for role_id in self.admin_role_ids)
+    
+    def is_moderator(self, member: discord.Member) -> bool:
+        return self.is_admin(member) or any(member.get_role(role_id) for role_id in self.mod_role_ids)
+    
+    def welcome_channel(self) -> Optional[discord.TextChannel]:
+        return self._resolve("welcome", lambda guild: guild.get_channel(self.settings["welcome_channel_id"]))
+    
+    def admin_log_channel(self) -> Optional[discord.TextChannel]:
+        return self._resolve("admin_log", lambda guild: guild.get_channel(self.settings["admin_log_channel_id"]))
+    
+    def ticket_log_channel(self) -> Optional[discord.TextChannel]:
+        return self._resolve("ticket_log", lambda guild: (
+            guild.get_channel(self.settings["ticket_log_channel_id"])
+            or discord.utils.get(guild.text_channels, name=TICKET_LOG_CHANNEL)
+        ))
+    
+    def trainee_role(self) -> Optional[discord.Role]:
+        return self._resolve("trainee", lambda guild: (
+            guild.get_role(self.settings["trainee_role_id"])
+            or discord.utils.get(guild.roles, name=TRAINEE_ROLE_NAME)
+        ))
+
+class GuildConfigStore:
+    """All guild configs, loaded once at startup; guilds never configured get defaults"""
+    
+    def __init__(self):
+        self.configs = {}  # guild_id -> GuildConfig
+    
+    def load(self):
+        for guild_id, settings in db.execute("SELECT guild_id, settings FROM guild_config").fetchall():
+            self.configs[guild_id] = GuildConfig(guild_id, json.loads(settings))
+    
+    def get(self, guild_id: int) -> GuildConfig:
+        config = self.configs.get(guild_id)
+        if config is None:
+            config = self.configs[guild_id] = GuildConfig(guild_id)
+        return config
+    
+    def invalidate(self, guild_id: int):
+        config = self.configs.get(guild_id)
+        if config:
+            config.invalidate()
+
+GUILD_CONFIGS = GuildConfigStore()
+GUILD_CONFIGS.load()
+
+def is_admin(user: Union[discord.Member, discord.User]) -> bool:
+    return isinstance(user, discord.Member) and GUILD_CONFIGS.get(user.guild.id).is_admin(user)
+
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    GUILD_CONFIGS.invalidate(role.guild.id)
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    GUILD_CONFIGS.invalidate(after.guild.id)
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    GUILD_CONFIGS.invalidate(role.guild.id)
+
+@bot.event
+async def on_guild_channel_create(channel: discord.abc.GuildChannel):
+    GUILD_CONFIGS.invalidate(channel.guild.id)
+
+@bot.event
+async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+    GUILD_CONFIGS.invalidate(after.guild.id)
+
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    GUILD_CONFIGS.invalidate(channel.guild.id)
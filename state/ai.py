@@ -0,0 +1,179 @@
+"""Obiz AI state: the answering service and its threads"""
+import asyncio
+import collections
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+import aiohttp
+
+from core import BUSY_CHECKS, QUOTES, DeadlineScheduler, db, log
+
+# Obiz AI
+AI_BACKEND = os.getenv("OBIZ_AI_BACKEND", "stub")  # "stub" for offline testing, or "http"
+AI_API_URL = os.getenv("OBIZ_AI_URL", "")  # An OpenAI-compatible chat completions endpoint
+AI_API_KEY = os.getenv("OBIZ_AI_KEY", "")
+AI_MODEL = os.getenv("OBIZ_AI_MODEL", "gpt-4o-mini")
+AI_SYSTEM_PROMPT = "You are Obiz AI, the friendly assistant of SARVAX Pvt Ltd's Discord server. Answer concisely."
+AI_BASE_COST = 10  # Coins per question...
+AI_MAX_COST = 15  # ...rising with length up to this
+AI_WORKERS = 4  # Backend calls in flight at once
+AI_QUEUE_SIZE = 100  # Questions waiting for a worker before new ones are refused
+AI_TIMEOUT = 60  # Seconds a question may wait and run in total
+AI_CACHE_SIZE = 500
+AI_CACHE_TTL = 6 * 3600  # Seconds a cached answer is reused for
+AI_THREAD_LIFETIME = timedelta(minutes=30)
+
+db.execute("CREATE TABLE IF NOT EXISTS ai_threads (thread_id INTEGER PRIMARY KEY, expires_at TEXT)")
+db.commit()
+
+class AIError(Exception):
+    """The question couldn't be answered; the asker is refunded"""
+
+class StubAIBackend:
+    """Offline stand-in for a model, answering after a short fake delay"""
+    
+    async def complete(self, prompt: str) -> str:
+        await asyncio.sleep(0.5)
+        return (
+            f"🤖 Obiz AI is running offline, so here's an echo of your question:\n\n> {prompt}\n\n"
+            f"💡 {random.choice(QUOTES)}"
+        )
+    
+    async def close(self):
+        pass
+
+class HTTPAIBackend:
+    """A model behind an OpenAI-compatible chat completions API"""
+    
+    def __init__(self, url: str, api_key: str, model: str):
+        self.url = url
+        self.api_key = api_key
+        self.model = model
+        self._session = None
+    
+    async def complete(self, prompt: str) -> str:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=AI_TIMEOUT))
+        
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": AI_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+        }
+        async with self._session.post(self.url, json=payload, headers={"Authorization": f"Bearer {self.api_key}"}) as response:
+            if response.status >= 400:
+                raise AIError(f"The AI service returned an error ({response.status})")
+            data = await response.json()
+        try:
+            return data["choices"][0]["message"]["content"].strip()
+        except (KeyError, IndexError, AttributeError):
+            raise AIError("The AI service sent back an answer I couldn't read")
+    
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+class TTLCache:
+    """An LRU cache whose entries also expire ``ttl`` seconds after being stored"""
+    
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()  # key -> (expires_at, value)
+    
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+    
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+class AIService:
+    """Answers questions through a fixed pool of workers in front of the backend.
+    
+    Answers are cached by normalized prompt, and identical questions that
+    arrive while one is being answered share the same backend call, so a
+    repeated question never reaches the backend twice.
+    """
+    
+    def __init__(self, backend):
+        self.backend = backend
+        self.cache = TTLCache(AI_CACHE_SIZE, AI_CACHE_TTL)
+        self.queue = asyncio.Queue(maxsize=AI_QUEUE_SIZE)
+        self.in_flight = {}  # normalized prompt -> future of its answer
+        self._workers = []
+    
+    def start(self):
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < AI_WORKERS:
+            self._workers.append(asyncio.create_task(self._work()))
+    
+    async def close(self):
+        """Release the backend's connections; the next question opens new ones"""
+        await self.backend.close()
+    
+    @staticmethod
+    def normalize(prompt: str) -> str:
+        return " ".join(prompt.lower().split())
+    
+    async def ask(self, prompt: str) -> str:
+        key = self.normalize(prompt)
+        answer = self.cache.get(key)
+        if answer is not None:
+            return answer
+        
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self.queue.put_nowait((prompt, key, future))
+            except asyncio.QueueFull:
+                raise AIError("Obiz AI is busy right now, please try again in a minute")
+            self.in_flight[key] = future
+        
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), AI_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise AIError("Obiz AI took too long to answer")
+    
+    async def _work(self):
+        while True:
+            prompt, key, future = await self.queue.get()
+            try:
+                answer = await self.backend.complete(prompt)
+            except Exception as e:
+                if not isinstance(e, AIError):
+                    log.exception("AI backend failed")
+                    e = AIError("Obiz AI couldn't answer that, please try again later")
+                future.set_exception(e)
+                future.exception()  # Nobody may be waiting any more; don't warn about it
+            else:
+                self.cache.put(key, answer)
+                future.set_result(answer)
+            finally:
+                self.in_flight.pop(key, None)
+
+AI_SERVICE = AIService(HTTPAIBackend(AI_API_URL, AI_API_KEY, AI_MODEL) if AI_BACKEND == "http" else StubAIBackend())
+BUSY_CHECKS.append(lambda: bool(AI_SERVICE.in_flight))
+
+AI_THREAD_EXPIRY = DeadlineScheduler()
+
+def load_ai_threads():
+    for thread_id, expires_at in db.execute("SELECT thread_id, expires_at FROM ai_threads").fetchall():
+        AI_THREAD_EXPIRY.schedule(thread_id, datetime.fromisoformat(expires_at))
+
+load_ai_threads()
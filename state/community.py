@@ -0,0 +1,183 @@
+"""Community state: the join pipeline and timezone greetings"""
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import discord
+import pytz
+
+from core import AUDIT_LOG, BUSY_CHECKS, GUILD_CONFIGS, QUOTES, DeadlineScheduler, db, log, snapshot
+
+# Join pipeline
+WELCOME_BATCH_WINDOW = 5  # Seconds of joins folded into one welcome announcement
+WELCOME_MAX_MENTIONS = 50  # Newcomers named in one announcement; the rest are counted
+ONBOARDING_WORKERS = 3  # Role grants and DMs in flight at once
+ONBOARDING_QUEUE_SIZE = 5000
+WELCOME_GIFS = [
+    "https://media.giphy.com/media/3o7aCTPPm4OHfRLSH6/giphy.gif",
+    "https://media.giphy.com/media/l0HU7ZeB2lJQY2vKU/giphy.gif",
+    "https://media.giphy.com/media/3o6Zt6ML6BklcajjsA/giphy.gif",
+    "https://media.giphy.com/media/3o7abKhOpu0NwenH3O/giphy.gif",
+    "https://media.giphy.com/media/3o7TKsQ8UQ1h6RakUw/giphy.gif"
+]
+
+class JoinPipeline:
+    """Onboarding for new members that holds up during join waves.
+    
+    ``add`` does no I/O. Each guild's newcomers are collected for
+    WELCOME_BATCH_WINDOW seconds and announced together in one embed, while the Trainee role
+    and welcome DM are handed to a fixed pool of workers so a raid can't
+    fan out into hundreds of concurrent REST calls. Starter coins come
+    from the user's stats row, which is created on first use.
+    """
+    
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=ONBOARDING_QUEUE_SIZE)
+        self.pending_welcomes = {}  # guild_id -> members waiting to be announced
+        self._welcome_tasks = {}  # guild_id -> task that will announce them
+        self._workers = []
+    
+    def start(self):
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < ONBOARDING_WORKERS:
+            self._workers.append(asyncio.create_task(self._work()))
+    
+    def add(self, member: discord.Member):
+        guild_id = member.guild.id
+        self.pending_welcomes.setdefault(guild_id, []).append(member)
+        task = self._welcome_tasks.get(guild_id)
+        if task is None or task.done():
+            self._welcome_tasks[guild_id] = asyncio.create_task(self._announce(guild_id))
+        
+        try:
+            self.queue.put_nowait(member)
+        except asyncio.QueueFull:
+            AUDIT_LOG.record("moderation", member.guild, f"⚠️ Onboarding queue full, skipped role and DM for {member.mention}")
+    
+    async def _announce(self, guild_id: int):
+        await asyncio.sleep(WELCOME_BATCH_WINDOW)
+        members = self.pending_welcomes.pop(guild_id, [])
+        
+        welcome_channel = GUILD_CONFIGS.get(guild_id).welcome_channel()
+        if not welcome_channel or not members:
+            return
+        
+        if len(members) == 1:
+            embed = discord.Embed(
+                title=f"✨ Welcome {members[0].display_name}!",
+                description=random.choice(QUOTES),
+                color=discord.Color.gold()
+            )
+            embed.set_footer(text="You've been awarded 🪙 1000 Obiz Coins to get started!")
+        else:
+            names = ", ".join(m.mention for m in members[:WELCOME_MAX_MENTIONS])
+            if len(members) > WELCOME_MAX_MENTIONS:
+                names += f" and {len(members) - WELCOME_MAX_MENTIONS} more"
+            embed = discord.Embed(
+                title=f"✨ Welcome to our {len(members)} newest members!",
+                description=f"{random.choice(QUOTES)}\n\n{names}",
+                color=discord.Color.gold()
+            )
+            embed.set_footer(text="You've each been awarded 🪙 1000 Obiz Coins to get started!")
+        embed.set_image(url=random.choice(WELCOME_GIFS))
+        
+        try:
+            await welcome_channel.send(embed=embed)
+        except discord.HTTPException:
+            pass
+    
+    async def _work(self):
+        while True:
+            member = await self.queue.get()
+            try:
+                await self._onboard(member)
+            except Exception:
+                log.exception("Onboarding failed for %s", member.id)
+    
+    async def _onboard(self, member: discord.Member):
+        role = GUILD_CONFIGS.get(member.guild.id).trainee_role()
+        if role:
+            try:
+                await member.add_roles(role, reason="New member")
+            except discord.HTTPException:
+                pass
+        
+        try:
+            dm_embed = discord.Embed(
+                title="🎉 Welcome to the Server!",
+                description="Here's your starter pack to get you going:",
+                color=discord.Color.green()
+            )
+            dm_embed.add_field(name="Obiz Coins", value="🪙 1000", inline=True)
+            dm_embed.add_field(name="Starter Role", value="👶 Trainee", inline=True)
+            dm_embed.add_field(name="First Steps", value="Use `/help` to see what you can do!", inline=False)
+            await member.send(embed=dm_embed)
+        except discord.HTTPException:
+            pass
+
+JOIN_PIPELINE = JoinPipeline()
+BUSY_CHECKS.append(lambda: not JOIN_PIPELINE.queue.empty())
+
+# Timezone greetings
+GREETINGS = {  # Local hour each greeting goes out at
+    "🌅 Good Morning": 7,
+    "🌇 Good Evening": 18,
+    "🌙 Good Night": 22
+}
+GREETING_MAX_MENTIONS = 100  # Members named per greeting; the rest are counted
+GREETING_BUCKETS = {}  # Format: {timezone: {channel_id: {user_id, ...}}}
+USER_TIMEZONES = {}  # Format: {user_id: (timezone, channel_id)}
+QUOTE_ROTATION = snapshot("quote_rotation", {})  # Format: {guild_id: index of the next quote}, keys as strings
+
+db.execute("CREATE TABLE IF NOT EXISTS user_timezones (user_id TEXT PRIMARY KEY, timezone TEXT, channel_id INTEGER)")
+db.commit()
+
+def next_quote(guild_id: int) -> str:
+    """The guild's next greeting quote, cycling through QUOTES in order"""
+    key = str(guild_id)
+    index = QUOTE_ROTATION.get(key, 0) % len(QUOTES)
+    QUOTE_ROTATION[key] = (index + 1) % len(QUOTES)
+    return QUOTES[index]
+
+def next_greeting_time(zone: str, hour: int) -> datetime:
+    """The next time it is ``hour``:00 in ``zone``, as a naive server-local datetime"""
+    tz = pytz.timezone(zone)
+    now = datetime.now(tz)
+    day = now.replace(tzinfo=None)
+    target = tz.normalize(tz.localize(day.replace(hour=hour, minute=0, second=0, microsecond=0)))
+    if target <= now:
+        target = tz.normalize(tz.localize((day + timedelta(days=1)).replace(hour=hour, minute=0, second=0, microsecond=0)))
+    return target.astimezone().replace(tzinfo=None)
+
+def join_greeting_bucket(user_id: str, zone: str, channel_id: int):
+    leave_greeting_bucket(user_id)
+    USER_TIMEZONES[user_id] = (zone, channel_id)
+    if zone not in GREETING_BUCKETS:
+        GREETING_BUCKETS[zone] = {}
+        for greeting, hour in GREETINGS.items():
+            GREETING_SCHEDULE.schedule((zone, greeting), next_greeting_time(zone, hour))
+    GREETING_BUCKETS[zone].setdefault(channel_id, set()).add(user_id)
+
+def leave_greeting_bucket(user_id: str):
+    """Drop a user from their bucket; an emptied bucket's wake-ups are cancelled"""
+    entry = USER_TIMEZONES.pop(user_id, None)
+    if not entry:
+        return
+    
+    zone, channel_id = entry
+    channels = GREETING_BUCKETS[zone]
+    channels[channel_id].discard(user_id)
+    if not channels[channel_id]:
+        del channels[channel_id]
+    if not channels:
+        del GREETING_BUCKETS[zone]
+        for greeting in GREETINGS:
+            GREETING_SCHEDULE.cancel((zone, greeting))
+
+GREETING_SCHEDULE = DeadlineScheduler()
+
+def load_greeting_buckets():
+    for user_id, zone, channel_id in db.execute("SELECT user_id, timezone, channel_id FROM user_timezones").fetchall():
+        join_greeting_bucket(user_id, zone, channel_id)
+
+load_greeting_buckets()
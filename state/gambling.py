@@ -0,0 +1,8 @@
+"""Gambling state: the jackpot pool"""
+from datetime import time, timezone
+
+from core import snapshot
+
+# The draw is at a fixed time of day, so restarts and reloads don't trigger an extra one
+JACKPOT_DRAW_TIME = time(hour=18, tzinfo=timezone.utc)
+JACKPOT_POOL = snapshot("jackpot_pool", {"total": 0, "participants": {}})
@@ -0,0 +1,187 @@
+"""Mini-game state: the word list, the trivia bank and games in progress"""
+import collections
+import mmap
+import os
+import random
+from datetime import timedelta
+from typing import Optional
+
+import discord
+import numpy as np
+
+from core import DeadlineScheduler
+
+# Word and trivia games
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # The word list and trivia bank sit next to bot.py
+WORDLE_WORDS_PATH = os.path.join(DATA_DIR, "wordle_words.txt")
+TRIVIA_BANK_PATH = os.path.join(DATA_DIR, "trivia.tsv")
+WORDLE_MAX_GUESSES = 6
+WORDLE_REWARDS = [250, 200, 150, 100, 75, 50]  # Coins for solving in 1, 2, ... 6 guesses
+WORDLE_HINTS = 1  # Letters a player may reveal per game
+WORDLE_TIMEOUT = timedelta(minutes=10)  # Idle time before a game is abandoned
+WORDLE_SQUARES = ["⬛", "🟨", "🟩"]
+TRIVIA_TIMEOUT = timedelta(seconds=30)
+TRIVIA_REWARD = 25
+
+class WordBank:
+    """Five-letter words precompiled for O(1) scoring and vectorized filtering.
+    
+    Each word is kept as five letter codes, a 26-bit mask of the letters
+    it contains and its per-letter counts. Narrowing the candidates after
+    a guess is a handful of array comparisons over the whole dictionary
+    rather than a scan of strings.
+    """
+    
+    def __init__(self, path: str):
+        with open(path, encoding="utf-8") as f:
+            self.words = sorted({w for w in (line.strip().lower() for line in f) if len(w) == 5 and w.isascii() and w.isalpha()})
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self.codes = [tuple(ord(c) - 97 for c in word) for word in self.words]
+        
+        self.letters = np.array(self.codes, dtype=np.uint8)  # (words, 5) letter codes
+        self.masks = np.bitwise_or.reduce(np.left_shift(np.uint32(1), self.letters.astype(np.uint32)), axis=1)
+        self.counts = np.zeros((len(self.words), 26), dtype=np.uint8)
+        np.add.at(self.counts, (np.arange(len(self.words))[:, None], self.letters), 1)
+    
+    def __len__(self) -> int:
+        return len(self.words)
+    
+    def score(self, guess: int, answer: int) -> tuple:
+        """Per-letter feedback: 2 for the right spot, 1 for elsewhere in the word, 0 for absent"""
+        guess_codes, answer_codes = self.codes[guess], self.codes[answer]
+        result = [0] * 5
+        unmatched = [0] * 26
+        for pos in range(5):
+            if guess_codes[pos] == answer_codes[pos]:
+                result[pos] = 2
+            else:
+                unmatched[answer_codes[pos]] += 1
+        for pos in range(5):
+            code = guess_codes[pos]
+            if result[pos] == 0 and unmatched[code]:
+                result[pos] = 1
+                unmatched[code] -= 1
+        return tuple(result)
+    
+    def narrow(self, candidates: np.ndarray, guess: int, feedback: tuple) -> np.ndarray:
+        """The candidates consistent with ``feedback`` for ``guess``"""
+        keep = candidates.copy()
+        found = collections.Counter()
+        absent = set()
+        for pos, (code, mark) in enumerate(zip(self.codes[guess], feedback)):
+            if mark == 2:
+                keep &= self.letters[:, pos] == code
+            else:
+                keep &= self.letters[:, pos] != code
+            if mark:
+                found[code] += 1
+            else:
+                absent.add(code)
+        
+        for code, count in found.items():
+            # A grey copy of a found letter pins its count exactly
+            keep &= (self.counts[:, code] == count) if code in absent else (self.counts[:, code] >= count)
+        for code in absent - found.keys():
+            keep &= (self.masks & np.uint32(1 << code)) == 0
+        return keep
+
+class TriviaBank:
+    """Trivia questions read on demand from a memory-mapped TSV file.
+    
+    Only the byte offset of each line is held in memory. Each guild draws
+    from its own shuffled order, so it sees no repeats until it has been
+    through the whole bank.
+    """
+    
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        starts = [0]
+        end = self._map.find(b"\n")
+        while end != -1:
+            starts.append(end + 1)
+            end = self._map.find(b"\n", end + 1)
+        if starts[-1] < len(self._map):
+            starts.append(len(self._map))
+        self.offsets = np.array(starts, dtype=np.uint32)
+        self.orders = {}  # guild_id -> (shuffled question numbers, position)
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def question(self, number: int) -> dict:
+        line = self._map[self.offsets[number]:self.offsets[number + 1]].decode("utf-8").rstrip("\r\n")
+        category, question, answer, *wrong = line.split("\t")
+        return {"category": category, "question": question, "answer": answer, "wrong": wrong}
+    
+    def draw(self, guild_id: int) -> dict:
+        order, position = self.orders.get(guild_id, (None, len(self)))
+        if position >= len(self):
+            order, position = np.random.permutation(len(self)), 0
+        self.orders[guild_id] = (order, position + 1)
+        return self.question(int(order[position]))
+
+WORD_BANK = WordBank(WORDLE_WORDS_PATH)
+TRIVIA_BANK = TriviaBank(TRIVIA_BANK_PATH)
+
+class WordleSession:
+    def __init__(self, answer: int):
+        self.answer = answer
+        self.guesses = []  # (word index, feedback)
+        self.candidates = np.ones(len(WORD_BANK), dtype=bool)
+        self.hints = {}  # position -> revealed letter
+    
+    @property
+    def solved(self) -> bool:
+        return bool(self.guesses) and self.guesses[-1][0] == self.answer
+    
+    @property
+    def over(self) -> bool:
+        return self.solved or len(self.guesses) >= WORDLE_MAX_GUESSES
+    
+    def guess(self, word: int):
+        feedback = WORD_BANK.score(word, self.answer)
+        self.guesses.append((word, feedback))
+        self.candidates = WORD_BANK.narrow(self.candidates, word, feedback)
+    
+    def hint(self) -> Optional[str]:
+        """Reveal a letter not yet placed, or None if no hints are left"""
+        if len(self.hints) >= WORDLE_HINTS:
+            return None
+        
+        answer = WORD_BANK.codes[self.answer]
+        placed = {pos for _, feedback in self.guesses for pos, mark in enumerate(feedback) if mark == 2}
+        hidden = [pos for pos in range(5) if pos not in placed and pos not in self.hints]
+        if not hidden:
+            return None
+        
+        pos = random.choice(hidden)
+        self.hints[pos] = chr(answer[pos] + 97)
+        self.candidates &= WORD_BANK.letters[:, pos] == answer[pos]
+        return f"Letter {pos + 1} is **{self.hints[pos].upper()}**"
+    
+    def to_embed(self) -> discord.Embed:
+        board = "\n".join(
+            f"{''.join(WORDLE_SQUARES[mark] for mark in feedback)} `{WORD_BANK.words[word].upper()}`"
+            for word, feedback in self.guesses
+        )
+        embed = discord.Embed(
+            title="🟩 Wordle",
+            description=board or "Guess the five-letter word with `/wordle guess:<word>`!",
+            color=discord.Color.green() if self.solved else discord.Color.dark_grey()
+        )
+        if self.hints:
+            embed.add_field(
+                name="💡 Hints",
+                value=" ".join(f"{pos + 1}: **{letter.upper()}**" for pos, letter in sorted(self.hints.items())),
+                inline=True
+            )
+        if not self.over:
+            embed.add_field(name="🔎 Possible Words", value=f"{int(self.candidates.sum())}", inline=True)
+        embed.set_footer(text=f"Guess {len(self.guesses)}/{WORDLE_MAX_GUESSES}")
+        return embed
+
+# Games in progress
+MINI_GAMES = {}  # Format: {(user_id, game): session} while a word or trivia game is in progress
+
+GAME_EXPIRY = DeadlineScheduler()
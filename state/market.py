@@ -0,0 +1,418 @@
+"""Market state: the stock market, loans and auctions"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import discord
+import numpy as np
+
+from core import SHOP_ITEMS, DeadlineScheduler, format_amount, get_user_stats, snapshot
+
+# Stock market
+STOCKS = {  # ticker -> (company, starting price, yearly drift, yearly volatility)
+    "SRVX": ("SARVAX Pvt Ltd", 120.0, 0.08, 0.25),
+    "OBZ": ("Obiz Coin Labs", 45.0, 0.12, 0.45),
+    "TKFL": ("TicketFlow Systems", 80.0, 0.05, 0.20),
+    "HACK": ("Hackathon Holdings", 25.0, 0.15, 0.60),
+    "GRND": ("Grind Industries", 60.0, 0.03, 0.15),
+    "PIXL": ("Pixel Forge Studios", 35.0, 0.10, 0.50)
+}
+MARKET_TICKS_PER_DAY = 24  # One price move per hour
+MARKET_HISTORY = MARKET_TICKS_PER_DAY * 7  # One week of ticks per ticker
+MARKET_BATCH = MARKET_TICKS_PER_DAY  # Ticks simulated per batch
+MARKET_TICK_TIMES = [  # Fixed UTC times of day, so restarts and reloads don't add ticks
+    (datetime.min + timedelta(days=i / MARKET_TICKS_PER_DAY)).time().replace(tzinfo=timezone.utc)
+    for i in range(MARKET_TICKS_PER_DAY)
+]
+
+class StockMarket:
+    """Geometric Brownian motion over every ticker at once.
+    
+    Price moves are drawn a batch of ticks at a time as one matrix of
+    growth factors. History is a ring buffer per ticker, so daily and
+    weekly changes are two index lookups. Each investor's portfolio value
+    is kept current with one matrix-vector product per tick, which makes
+    quotes and portfolio lookups O(1).
+    """
+    
+    def __init__(self, stocks: dict, history: int = MARKET_HISTORY, batch: int = MARKET_BATCH):
+        self.tickers = list(stocks)
+        self.ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.companies = [stocks[t][0] for t in self.tickers]
+        self.prices = np.array([stocks[t][1] for t in self.tickers], dtype=np.float64)
+        self.drift = np.array([stocks[t][2] for t in self.tickers], dtype=np.float64)
+        self.volatility = np.array([stocks[t][3] for t in self.tickers], dtype=np.float64)
+        self.dt = 1 / (365 * MARKET_TICKS_PER_DAY)
+        self.batch = batch
+        self.rng = np.random.default_rng()
+        self._factors = np.empty((0, len(self.tickers)))
+        self._cursor = 0
+        
+        self.history = np.repeat(self.prices[:, None], history, axis=1)
+        self.head = 0  # Column of the latest price
+        
+        self.slots = {}  # user_id -> holder row
+        self.holdings = np.zeros((64, len(self.tickers)), dtype=np.float64)  # Shares per holder and ticker
+        self.values = np.zeros(64, dtype=np.float64)  # holdings @ prices, per holder
+    
+    def _simulate(self):
+        shocks = self.rng.standard_normal((self.batch, len(self.tickers)))
+        log_returns = (self.drift - 0.5 * self.volatility ** 2) * self.dt + self.volatility * math.sqrt(self.dt) * shocks
+        self._factors = np.exp(log_returns)
+        self._cursor = 0
+    
+    def tick(self):
+        if self._cursor == len(self._factors):
+            self._simulate()
+        
+        old_prices = self.prices
+        self.prices = old_prices * self._factors[self._cursor]
+        self._cursor += 1
+        
+        self.head = (self.head + 1) % self.history.shape[1]
+        self.history[:, self.head] = self.prices
+        
+        holders = len(self.slots)
+        self.values[:holders] += self.holdings[:holders] @ (self.prices - old_prices)
+    
+    def price_ago(self, i: int, ticks: int) -> float:
+        ticks = min(ticks, self.history.shape[1] - 1)
+        return self.history[i, (self.head - ticks) % self.history.shape[1]]
+    
+    def quote(self, ticker: str) -> dict:
+        i = self.ticker_index[ticker]
+        price = float(self.prices[i])
+        return {
+            "ticker": ticker,
+            "company": self.companies[i],
+            "price": price,
+            "day": price / float(self.price_ago(i, MARKET_TICKS_PER_DAY)) - 1,
+            "week": price / float(self.price_ago(i, MARKET_HISTORY)) - 1
+        }
+    
+    def holder(self, user_id: str) -> int:
+        slot = self.slots.get(user_id)
+        if slot is None:
+            slot = len(self.slots)
+            if slot == len(self.values):
+                self.holdings = np.vstack([self.holdings, np.zeros_like(self.holdings)])
+                self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+            self.slots[user_id] = slot
+        return slot
+    
+    def shares(self, user_id: str, ticker: str) -> float:
+        slot = self.slots.get(user_id)
+        return 0 if slot is None else float(self.holdings[slot, self.ticker_index[ticker]])
+    
+    def portfolio_value(self, user_id: str) -> float:
+        slot = self.slots.get(user_id)
+        return 0 if slot is None else float(self.values[slot])
+    
+    def positions(self, user_id: str) -> List[tuple]:
+        slot = self.slots.get(user_id)
+        if slot is None:
+            return []
+        row = self.holdings[slot]
+        return [(self.tickers[i], float(row[i]), float(row[i] * self.prices[i])) for i in np.flatnonzero(row)]
+    
+    def trade(self, user_id: str, ticker: str, shares: int) -> float:
+        """Buy (positive) or sell (negative) shares at the current price; returns the coin cost"""
+        slot = self.holder(user_id)
+        i = self.ticker_index[ticker]
+        self.holdings[slot, i] += shares
+        self.values[slot] += shares * self.prices[i]
+        return round(shares * float(self.prices[i]), 2)
+    
+    def to_snapshot(self) -> dict:
+        holders = len(self.slots)
+        return {
+            "tickers": self.tickers,
+            "prices": self.prices.tolist(),
+            "history": self.history.tolist(),
+            "head": self.head,
+            "slots": self.slots,
+            "holdings": self.holdings[:holders].tolist()
+        }
+    
+    def restore(self, data: dict):
+        """Load prices and holdings from ``to_snapshot``, matching tickers by name"""
+        saved = {ticker: j for j, ticker in enumerate(data["tickers"])}
+        ours = [i for i, ticker in enumerate(self.tickers) if ticker in saved]
+        theirs = [saved[self.tickers[i]] for i in ours]
+        
+        self.prices[ours] = np.array(data["prices"])[theirs]
+        history = np.array(data["history"]).reshape(len(saved), -1)[theirs]
+        if history.shape[1] == self.history.shape[1]:
+            self.history[ours] = history
+            self.head = data["head"]
+        else:
+            self.history[ours] = self.prices[ours, None]
+        
+        holdings = np.array(data["holdings"], dtype=np.float64).reshape(-1, len(saved))
+        for user_id, slot in data["slots"].items():
+            self.holdings[self.holder(user_id), ours] = holdings[slot, theirs]
+        holders = len(self.slots)
+        self.values[:holders] = self.holdings[:holders] @ self.prices
+
+MARKET = snapshot("stock_market", StockMarket(STOCKS), StockMarket.to_snapshot, StockMarket.restore)
+
+# Loans
+LOAN_DAILY_RATE = 0.05  # Continuously compounded interest per day
+LOAN_TERM = timedelta(days=7)
+MAX_LOAN = 5000
+
+def restore_loans(loans: dict, saved: dict):
+    loans.update((loan["id"], loan) for loan in saved.values())  # Snapshot keys come back as strings
+
+LOANS = snapshot("loans", {}, restore=restore_loans)  # Format: {loan_id: {"user_id", "principal", "units", "index", "taken_at", "due", "status", "repaid", "closed_at"}}
+USER_LOANS = snapshot("user_loans", {})  # Format: {user_id: [loan_id, ...]} in the order they were taken
+LOAN_COUNTER = max(LOANS, default=0)
+
+class InterestIndex:
+    """Compounded growth factor shared by every loan.
+    
+    A loan stores its balance in index units, so the amount owed is
+    ``units * index.value()`` and nothing has to revisit loans to accrue
+    interest. Changing the rate rebases the index without touching them.
+    """
+    
+    def __init__(self, daily_rate: float):
+        self.base = 1.0
+        self.base_time = time.time()
+        self.rate = daily_rate / 86400
+    
+    def value(self, at: Optional[float] = None) -> float:
+        at = time.time() if at is None else at
+        return self.base * math.exp(self.rate * (at - self.base_time))
+    
+    def set_rate(self, daily_rate: float):
+        now = time.time()
+        self.base = self.value(now)
+        self.base_time = now
+        self.rate = daily_rate / 86400
+    
+    def to_snapshot(self) -> dict:
+        return {"base": self.base, "base_time": self.base_time, "rate": self.rate}
+    
+    def restore(self, data: dict):
+        self.base, self.base_time, self.rate = data["base"], data["base_time"], data["rate"]
+
+LOAN_INDEX = snapshot("loan_index", InterestIndex(LOAN_DAILY_RATE), InterestIndex.to_snapshot, InterestIndex.restore)
+
+def loan_balance(loan: dict) -> float:
+    if loan["status"] != "active":
+        return 0
+    return round(loan["units"] * LOAN_INDEX.value(), 2)
+
+def active_loan(user_id: str) -> Optional[dict]:
+    loan_ids = USER_LOANS.get(user_id)
+    if loan_ids and LOANS[loan_ids[-1]]["status"] == "active":
+        return LOANS[loan_ids[-1]]
+    return None
+
+def take_loan(user_id: str, amount: int) -> dict:
+    global LOAN_COUNTER
+    
+    LOAN_COUNTER += 1
+    now = datetime.now()
+    index = LOAN_INDEX.value()
+    loan = {
+        "id": LOAN_COUNTER,
+        "user_id": user_id,
+        "principal": amount,
+        "units": amount / index,
+        "index": index,
+        "taken_at": now,
+        "due": now + LOAN_TERM,
+        "status": "active",
+        "repaid": 0,
+        "closed_at": None
+    }
+    LOANS[loan["id"]] = loan
+    USER_LOANS.setdefault(user_id, []).append(loan["id"])
+    LOAN_DUES.schedule(loan["id"], loan["due"])
+    
+    get_user_stats(user_id)["coins"] += amount
+    return loan
+
+def repay_loan(loan: dict, amount: float) -> float:
+    """Repay up to ``amount`` from the borrower's coins; returns what was paid"""
+    stats = get_user_stats(loan["user_id"])
+    paid = round(min(amount, loan_balance(loan), stats["coins"]), 2)
+    if paid <= 0:
+        return 0
+    
+    stats["coins"] -= paid
+    loan["repaid"] += paid
+    loan["units"] -= paid / LOAN_INDEX.value()
+    if loan_balance(loan) <= 0:
+        loan["status"] = "repaid"
+        loan["units"] = 0
+        loan["closed_at"] = datetime.now()
+        LOAN_DUES.cancel(loan["id"])
+    return paid
+
+def repay_debt(user_id: str, amount: float) -> float:
+    """Pay down what defaulted loans left owing from the user's coins; returns what was paid"""
+    stats = get_user_stats(user_id)
+    paid = round(min(amount, stats.get("loan_debt", 0), stats["coins"]), 2)
+    if paid <= 0:
+        return 0
+    
+    stats["coins"] -= paid
+    stats["loan_debt"] = round(stats["loan_debt"] - paid, 2)
+    return paid
+
+LOAN_DUES = DeadlineScheduler()
+for loan in LOANS.values():
+    if loan["status"] == "active":
+        LOAN_DUES.schedule(loan["id"], loan["due"])
+
+# Auctions
+AUCTION_DURATION = timedelta(minutes=10)
+AUCTION_SNIPE_WINDOW = timedelta(seconds=30)  # Bids this close to the end extend it...
+AUCTION_SNIPE_EXTENSION = timedelta(seconds=30)  # ...to at least this long after the bid
+AUCTION_MIN_INCREMENT = 50
+AUCTION_EDIT_INTERVAL = 2  # Seconds between edits of an auction message
+AUCTIONS = {}  # Format: {auction_id: Auction} while the auction is open
+AUCTION_COUNTER = 0
+
+class Auction:
+    """A live auction of a shop item.
+    
+    Bids are kept in a max-heap. The leading bid's coins are held in
+    escrow and refunded as soon as it is outbid, so a bid is validated
+    and escrowed in one step with no await in between. The auction
+    message is re-rendered at most every AUCTION_EDIT_INTERVAL seconds,
+    with any burst of bids in between folded into one edit.
+    """
+    
+    def __init__(self, auction_id: int, item: str, host: discord.Member, starting_bid: int):
+        self.id = auction_id
+        self.item = item
+        self.host = host
+        self.starting_bid = starting_bid
+        self.ends_at = datetime.now() + AUCTION_DURATION
+        self.bids = []  # Heap of (-amount, seq, user_id, display name)
+        self.escrow = {}  # user_id -> coins held for their leading bid
+        self.status = "Open"
+        self.message = None
+        self.view = None  # Stopped on close so discord.py drops it from its view store
+        self._seq = itertools.count()
+        self._last_edit = 0
+        self._edit_task = None
+        self._dirty = False
+    
+    @property
+    def leader(self) -> Optional[tuple]:
+        """(amount, user_id, display name) of the leading bid"""
+        if not self.bids:
+            return None
+        amount, _, user_id, name = self.bids[0]
+        return -amount, user_id, name
+    
+    def min_bid(self) -> int:
+        leader = self.leader
+        return leader[0] + AUCTION_MIN_INCREMENT if leader else self.starting_bid
+    
+    def place_bid(self, member: discord.Member, amount: int) -> Optional[str]:
+        """Validate, escrow and record a bid; returns an error message if it was refused"""
+        if self.status != "Open":
+            return "This auction has ended"
+        if amount < self.min_bid():
+            return f"Bids must be at least 🪙 {self.min_bid()}"
+        
+        user_id = str(member.id)
+        stats = get_user_stats(user_id)
+        already_held = self.escrow.get(user_id, 0)
+        if stats["coins"] < amount - already_held:
+            return f"You only have 🪙 {format_amount(stats['coins'])}"
+        
+        # Escrow the new bid and refund whoever it displaced
+        previous = self.leader
+        stats["coins"] -= amount - already_held
+        self.escrow[user_id] = amount
+        heapq.heappush(self.bids, (-amount, next(self._seq), user_id, member.display_name))
+        if previous and previous[1] != user_id:
+            get_user_stats(previous[1])["coins"] += self.escrow.pop(previous[1])
+        
+        now = datetime.now()
+        if self.ends_at - now < AUCTION_SNIPE_WINDOW:
+            self.ends_at = now + AUCTION_SNIPE_EXTENSION
+            AUCTION_CLOSINGS.schedule(self.id, self.ends_at)
+        
+        self.request_refresh()
+        return None
+    
+    def cancel(self):
+        """Call the auction off, refunding the escrowed leading bid"""
+        self.status = "Cancelled"
+        if self.view:
+            self.view.stop()
+        for user_id, amount in self.escrow.items():
+            get_user_stats(user_id)["coins"] += amount
+        self.escrow.clear()
+        AUCTION_CLOSINGS.cancel(self.id)
+    
+    def to_embed(self) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"🔨 Auction #{self.id}: {self.item}",
+            description=SHOP_ITEMS[self.item]["description"],
+            color=discord.Color.gold() if self.status == "Open" else discord.Color.dark_grey()
+        )
+        
+        leader = self.leader
+        if leader:
+            embed.add_field(name="💰 Highest Bid", value=f"🪙 {leader[0]} by **{leader[2]}**", inline=True)
+        else:
+            embed.add_field(name="💰 Starting Bid", value=f"🪙 {self.starting_bid}", inline=True)
+        
+        if self.status == "Open":
+            embed.add_field(name="⏰ Ends", value=discord.utils.format_dt(self.ends_at, "R"), inline=True)
+            embed.add_field(name="📈 Next Bid", value=f"🪙 {self.min_bid()}", inline=True)
+        elif self.status == "Cancelled":
+            embed.add_field(name="🏁 Result", value="Cancelled, bids refunded", inline=True)
+        else:
+            embed.add_field(name="🏁 Result", value=f"Won by **{leader[2]}**" if leader else "No bids", inline=True)
+        
+        top_bids = heapq.nsmallest(3, self.bids)
+        if top_bids:
+            embed.add_field(
+                name="📜 Top Bids",
+                value="\n".join(f"🪙 {-amount} - {name}" for amount, _, _, name in top_bids),
+                inline=False
+            )
+        
+        embed.set_footer(text=f"{len(self.bids)} bids • Hosted by {self.host.display_name}")
+        return embed
+    
+    def request_refresh(self):
+        """Mark the auction message stale, starting an edit task unless one is pending"""
+        self._dirty = True
+        if self.message and (self._edit_task is None or self._edit_task.done()):
+            self._edit_task = asyncio.create_task(self._refresh())
+    
+    async def _refresh(self):
+        while self._dirty:
+            delay = self._last_edit + AUCTION_EDIT_INTERVAL - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            # Everything that changed while waiting goes out in this one edit
+            self._dirty = False
+            self._last_edit = time.monotonic()
+            try:
+                await self.message.edit(embed=self.to_embed(), view=None if self.status != "Open" else discord.utils.MISSING)
+            except discord.HTTPException:
+                pass
+
+AUCTION_CLOSINGS = DeadlineScheduler()
+
+def next_auction_id() -> int:
+    global AUCTION_COUNTER
+    AUCTION_COUNTER += 1
+    return AUCTION_COUNTER
@@ -0,0 +1,142 @@
+"""Pet state: every virtual pet and their hunger alerts"""
+import time
+from datetime import datetime
+from typing import Optional
+
+import discord
+
+from core import INVENTORY, DeadlineScheduler, award, db
+
+# Virtual pets
+PET_SPECIES = {"Dog": "🐶", "Cat": "🐱", "Fox": "🦊", "Dragon": "🐉"}
+PET_ADOPT_COST = 500
+PET_FEED_COST = 20
+PET_FEED_AMOUNT = 40  # Hunger removed per feeding
+PET_FEED_XP = 10
+PET_FULL = 30  # Pets won't eat below this hunger, so XP can't be bought faster than hunger rises
+PET_XP_PER_LEVEL = 100
+PET_HUNGER_PER_HOUR = 4  # Full to starving in about a day
+PET_HUNGRY = 70  # Pets stop earning, and owners are warned, from this hunger...
+PET_STARVING = 100  # ...and lose XP from here
+PET_XP_DECAY_PER_HOUR = 5
+PET_COINS_PER_HOUR = 2  # Per pet level, while the pet isn't hungry
+PET_MAX_EARNING_LEVEL = 10  # Levels past this don't raise earnings
+PET_LEVEL_UP_BONUS = 50  # Flat coins per level gained
+PETS = {}  # Format: {user_id: Pet}
+
+db.execute("""CREATE TABLE IF NOT EXISTS pets (
+    user_id TEXT PRIMARY KEY, name TEXT, species TEXT, adopted_at REAL,
+    fed_at REAL, hunger REAL, xp REAL, paid_until REAL
+)""")
+db.commit()
+
+class Pet:
+    """A pet whose state is a closed-form function of the time since it was last fed.
+    
+    Only the values at the last feeding are stored. Hunger rises linearly
+    from there, coins accrue until the pet gets hungry and XP decays once it
+    is starving, so reading a pet at any time is O(1) and nothing ticks
+    in the background.
+    """
+    
+    def __init__(self, user_id: str, name: str, species: str, adopted_at: float,
+                 fed_at: float, hunger: float, xp: float, paid_until: float):
+        self.user_id = user_id
+        self.name = name
+        self.species = species
+        self.adopted_at = adopted_at
+        self.fed_at = fed_at
+        self.hunger_at_feed = hunger
+        self.xp_at_feed = xp
+        self.paid_until = paid_until  # Earnings up to here have been credited
+    
+    def _time_at_hunger(self, hunger: float) -> float:
+        return self.fed_at + max(0, hunger - self.hunger_at_feed) / PET_HUNGER_PER_HOUR * 3600
+    
+    def hunger(self, now: float) -> float:
+        return min(PET_STARVING, self.hunger_at_feed + (now - self.fed_at) / 3600 * PET_HUNGER_PER_HOUR)
+    
+    def xp(self, now: float) -> float:
+        starving_for = max(0, now - self._time_at_hunger(PET_STARVING))
+        return max(0, self.xp_at_feed - starving_for / 3600 * PET_XP_DECAY_PER_HOUR)
+    
+    def level(self, now: float) -> int:
+        return 1 + int(self.xp(now) // PET_XP_PER_LEVEL)
+    
+    def unpaid_earnings(self, now: float) -> float:
+        # XP only decays after earnings stop, so the level is fixed while earning
+        earning_until = min(now, self._time_at_hunger(PET_HUNGRY))
+        return max(0, earning_until - self.paid_until) / 3600 * self.coins_per_hour(int(1 + self.xp_at_feed // PET_XP_PER_LEVEL))
+    
+    @staticmethod
+    def coins_per_hour(level: int) -> int:
+        return PET_COINS_PER_HOUR * min(level, PET_MAX_EARNING_LEVEL)
+    
+    def next_alert(self, now: float) -> Optional[float]:
+        """When the owner should next hear about this pet's hunger"""
+        for threshold in (PET_HUNGRY, PET_STARVING):
+            when = self._time_at_hunger(threshold)
+            if when > now:
+                return when
+        return None
+    
+    def settle(self, now: float) -> float:
+        """Credit the owner with everything earned so far; returns the coins credited"""
+        earned = self.unpaid_earnings(now)
+        self.paid_until = now
+        return award(self.user_id, coins=round(earned, 2))["coins"] if earned >= 0.01 else 0
+    
+    def feed(self, now: float) -> int:
+        """Rebase the pet's state on a feeding; returns the levels gained"""
+        level_before = self.level(now)
+        self.hunger_at_feed = max(0, self.hunger(now) - PET_FEED_AMOUNT)
+        self.xp_at_feed = self.xp(now) + PET_FEED_XP * INVENTORY.multipliers(self.user_id)["pet_xp"]
+        self.fed_at = now
+        return self.level(now) - level_before
+    
+    def save(self):
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO pets VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.user_id, self.name, self.species, self.adopted_at,
+                 self.fed_at, self.hunger_at_feed, self.xp_at_feed, self.paid_until)
+            )
+    
+    def to_embed(self, now: float) -> discord.Embed:
+        hunger = self.hunger(now)
+        if hunger >= PET_STARVING:
+            mood = "😵 Starving"
+        elif hunger >= PET_HUNGRY:
+            mood = "😟 Hungry"
+        else:
+            mood = "😊 Happy"
+        
+        embed = discord.Embed(
+            title=f"{PET_SPECIES[self.species]} {self.name}",
+            description=f"{mood} • Adopted {discord.utils.format_dt(datetime.fromtimestamp(self.adopted_at), 'R')}",
+            color=discord.Color.green() if hunger < PET_HUNGRY else discord.Color.orange()
+        )
+        filled = int(hunger // 10)
+        embed.add_field(name="🍖 Hunger", value=f"{'🟥' * filled}{'⬜' * (10 - filled)} {hunger:.0f}%", inline=False)
+        embed.add_field(name="📊 Level", value=f"{self.level(now)}", inline=True)
+        embed.add_field(name="✨ XP", value=f"{self.xp(now) % PET_XP_PER_LEVEL:.0f}/{PET_XP_PER_LEVEL}", inline=True)
+        embed.add_field(name="🪙 Earning", value=f"{self.coins_per_hour(self.level(now))}/hr" if hunger < PET_HUNGRY else "Paused", inline=True)
+        return embed
+
+# All pets' hunger alerts share one heap
+PET_ALERTS = DeadlineScheduler()
+
+def schedule_pet_alert(pet: Pet, now: float):
+    next_alert = pet.next_alert(now)
+    if next_alert:
+        PET_ALERTS.schedule(pet.user_id, datetime.fromtimestamp(next_alert))
+    else:
+        PET_ALERTS.cancel(pet.user_id)
+
+def load_pets():
+    now = time.time()
+    for row in db.execute("SELECT * FROM pets").fetchall():
+        pet = PETS[row[0]] = Pet(*row)
+        schedule_pet_alert(pet, now)
+
+load_pets()
@@ -0,0 +1,309 @@
+"""Ticket state: open tickets, reminders, comments, deadline notices and the search index"""
+import collections
+import math
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import discord
+
+from core import DeadlineScheduler, bot, db, snapshot
+
+# Tickets and reminders
+SAVED_TICKETS = []  # Snapshotted tickets waiting for their members to be cached, see restore_saved_tickets
+TICKETS_DB = snapshot(
+    "tickets", {},
+    dump=lambda tickets: [ticket.to_snapshot() for ticket in tickets.values()] + SAVED_TICKETS,
+    restore=lambda tickets, saved: SAVED_TICKETS.extend(saved)
+)
+REMINDERS = snapshot("reminders", [])
+
+# Premium UI Constants
+PRIORITY_OPTIONS = [
+    discord.SelectOption(label="🔥 Critical", value="Critical", emoji="🔥", description="Immediate attention required"),
+    discord.SelectOption(label="⚠️ High", value="High", emoji="⚠️", description="Important task"),
+    discord.SelectOption(label="✨ Medium", value="Medium", emoji="✨", description="Normal priority"),
+    discord.SelectOption(label="🌿 Low", value="Low", emoji="🌿", description="Low priority")
+]
+
+CATEGORIES = [
+    discord.SelectOption(label="💻 IT Support", value="IT"),
+    discord.SelectOption(label="👥 HR", value="HR"),
+    discord.SelectOption(label="💰 Finance", value="Finance"),
+    discord.SelectOption(label="📢 Marketing", value="Marketing"),
+    discord.SelectOption(label="📝 General", value="General")
+]
+
+STATUS_EMOJIS = {
+    "Open": "🔓",
+    "In Progress": "🔄",
+    "On Hold": "⏸️",
+    "Completed": "✅",
+    "Rejected": "❌",
+    "Closed": "🔒"
+}
+
+# Deadline notices
+DEADLINE_FORMAT = "%d/%m/%Y"
+DEADLINE_WARNING = timedelta(hours=24)  # "Approaching deadline" notice lead time
+CLOSED_STATUSES = {"Completed", "Rejected", "Closed"}
+
+# Inactivity auto-close
+INACTIVITY_CLOSE_AFTER = timedelta(days=7)
+INACTIVITY_WARNING = timedelta(hours=24)  # Warning lead time before auto-close
+
+def parse_deadline(text: str) -> datetime:
+    """Parse a DD/MM/YYYY deadline, rejecting malformed or past dates"""
+    try:
+        deadline = datetime.strptime(text.strip(), DEADLINE_FORMAT)
+    except ValueError:
+        raise ValueError(f"Deadline `{text}` is not a valid date, use DD/MM/YYYY (e.g., 30/06/2025)")
+    
+    if deadline.date() < datetime.now().date():
+        raise ValueError("Deadline can't be in the past")
+    return deadline
+
+# Ticket comments
+COMMENTS_PER_PAGE = 5
+
+db.execute("""CREATE TABLE IF NOT EXISTS ticket_comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, ticket_id INTEGER, author TEXT, content TEXT, created_at TEXT
+)""")
+db.execute("CREATE INDEX IF NOT EXISTS ticket_comments_by_ticket ON ticket_comments (ticket_id, id)")
+db.commit()
+
+# Ticket numbers are never reused: the counter is persisted, and also kept past every
+# ticket with stored comments, so old comments and old messages' buttons never reach a new ticket
+TICKET_COUNTER = max(
+    int(db.execute("SELECT COALESCE(MAX(value), 0) FROM bot_meta WHERE key = 'ticket_counter'").fetchone()[0]),
+    db.execute("SELECT COALESCE(MAX(ticket_id), 0) FROM ticket_comments").fetchone()[0]
+)
+
+def next_ticket_id() -> int:
+    global TICKET_COUNTER
+    TICKET_COUNTER += 1
+    with db:
+        db.execute("INSERT OR REPLACE INTO bot_meta (key, value) VALUES ('ticket_counter', ?)", (str(TICKET_COUNTER),))
+    return TICKET_COUNTER
+
+def load_comment_page(ticket_id: int, before: Optional[int] = None) -> List[dict]:
+    """One page of a ticket's comments, newest first, older than comment id ``before``"""
+    rows = db.execute(
+        "SELECT id, author, content, created_at FROM ticket_comments WHERE ticket_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+        (ticket_id, before if before is not None else math.inf, COMMENTS_PER_PAGE)
+    ).fetchall()
+    return [
+        {"id": comment_id, "author": author, "content": content, "timestamp": datetime.fromisoformat(created_at)}
+        for comment_id, author, content, created_at in rows
+    ]
+
+class Ticket:
+    def __init__(self, ticket_id: int, creator: discord.Member, assignee: discord.Member, 
+                 title: str, description: str, deadline: datetime, priority: str, category: str):
+        self.id = ticket_id
+        self.creator = creator
+        self.assignee = assignee
+        self.title = title
+        self.description = description
+        self.deadline_at = deadline + timedelta(days=1)  # Due at the end of the deadline day
+        self.deadline = deadline.strftime(DEADLINE_FORMAT)
+        self.priority = priority
+        self.category = category
+        self.status = "Open"
+        self.created_at = datetime.now()
+        self.last_activity = self.created_at
+        self.inactivity_warned = False
+        self.comment_count = 0  # Comments live in ticket_comments; only the latest is kept here
+        self.last_comment = None
+        self.attachments = []
+        self.completed_at = None
+        self.custom_fields = {}
+    
+    def touch(self):
+        """Record activity on the ticket, postponing its inactivity auto-close"""
+        self.last_activity = datetime.now()
+        self.inactivity_warned = False
+    
+    def add_comment(self, author: str, content: str):
+        now = datetime.now()
+        with db:
+            db.execute(
+                "INSERT INTO ticket_comments (ticket_id, author, content, created_at) VALUES (?, ?, ?, ?)",
+                (self.id, author, content, now.isoformat())
+            )
+        self.comment_count += 1
+        self.last_comment = {"author": author, "content": content, "timestamp": now}
+    
+    def to_snapshot(self) -> dict:
+        """Plain data for the shutdown snapshot, with members stored by id"""
+        return {
+            "guild": self.creator.guild.id,
+            "saved_at": datetime.now(),
+            "fields": {**vars(self), "creator": self.creator.id, "assignee": self.assignee.id}
+        }
+    
+    @classmethod
+    def from_snapshot(cls, data: dict, guild: discord.Guild) -> Optional["Ticket"]:
+        """Rebuild a snapshotted ticket, or None while its members aren't in ``guild``'s cache"""
+        fields = data["fields"]
+        creator, assignee = guild.get_member(fields["creator"]), guild.get_member(fields["assignee"])
+        if creator is None or assignee is None:
+            return None
+        
+        ticket = cls.__new__(cls)
+        vars(ticket).update(fields, creator=creator, assignee=assignee)
+        return ticket
+    
+    def to_embed(self) -> discord.Embed:
+        """Convert ticket to a beautiful embed"""
+        color = {
+            "Critical": discord.Color.red(),
+            "High": discord.Color.orange(),
+            "Medium": discord.Color.gold(),
+            "Low": discord.Color.green()
+        }.get(self.priority, discord.Color.blue())
+        
+        embed = discord.Embed(
+            title=f"🎫 Ticket #{self.id}: {self.title}",
+            description=f"```\n{self.description}\n```",
+            color=color,
+            timestamp=self.created_at
+        )
+        
+        embed.add_field(name="📋 Category", value=f"{self.category}", inline=True)
+        embed.add_field(name="⏱️ Status", value=f"{STATUS_EMOJIS.get(self.status)} {self.status}", inline=True)
+        embed.add_field(name="🚨 Priority", value=f"{self.priority}", inline=True)
+        embed.add_field(name="📅 Deadline", value=f"`{self.deadline}`", inline=True)
+        embed.add_field(name="👤 Created By", value=self.creator.mention, inline=True)
+        embed.add_field(name="👷 Assigned To", value=self.assignee.mention, inline=True)
+        
+        if self.last_comment:
+            embed.add_field(
+                name=f"💬 Last Comment ({self.comment_count} total)", 
+                value=f"**{self.last_comment['author']}:** {self.last_comment['content']}"[:1024], 
+                inline=False
+            )
+        
+        if self.attachments:
+            embed.add_field(
+                name="📎 Attachments", 
+                value="\n".join(f"[Attachment {i+1}]({url})" for i, url in enumerate(self.attachments)), 
+                inline=False
+            )
+        
+        if self.status == "Completed" and self.completed_at:
+            embed.add_field(
+                name="⏱️ Completion Time",
+                value=f"Completed in {(self.completed_at - self.created_at).total_seconds() / 3600:.1f} hours",
+                inline=False
+            )
+        
+        embed.set_footer(text=f"Created at • Ticket ID: {self.id}")
+        embed.set_thumbnail(url="https://i.imgur.com/7W6mEfK.png")
+        
+        return embed
+
+def index_ticket_deadline(ticket: Ticket):
+    """Add an open ticket's deadline notices to the deadline index"""
+    warn_at = ticket.deadline_at - DEADLINE_WARNING
+    if warn_at > datetime.now():
+        DEADLINE_INDEX.schedule(("due_soon", ticket.id), warn_at)
+    DEADLINE_INDEX.schedule(("overdue", ticket.id), ticket.deadline_at)
+
+def unindex_ticket_deadline(ticket_id: int):
+    DEADLINE_INDEX.cancel(("due_soon", ticket_id))
+    DEADLINE_INDEX.cancel(("overdue", ticket_id))
+
+# Callbacks for these and the other schedulers are bound by the extension that owns them
+DEADLINE_INDEX = DeadlineScheduler()
+INACTIVITY_INDEX = DeadlineScheduler()
+
+# Ticket search
+SEARCH_RESULTS = 10
+SEARCH_TITLE_WEIGHT = 2  # Title words count this many times
+BM25_K1 = 1.2
+BM25_B = 0.75
+SEARCH_TOKEN = re.compile(r"[a-z0-9]+")
+
+class SearchIndex:
+    """An inverted index over ticket text, ranked with BM25.
+    
+    Postings map each term to the tickets containing it and how often.
+    Text is only ever appended to a ticket (on creation and with each
+    comment), so updates touch just the new words' postings, and a query
+    only visits the postings of its own terms.
+    """
+    
+    def __init__(self):
+        self.postings = collections.defaultdict(dict)  # term -> {ticket_id: term frequency}
+        self.lengths = {}  # ticket_id -> number of indexed words
+        self.total_length = 0
+    
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return SEARCH_TOKEN.findall(text.lower())
+    
+    def add(self, ticket_id: int, text: str, weight: int = 1):
+        terms = collections.Counter(self.tokenize(text))
+        for term, count in terms.items():
+            postings = self.postings[term]
+            postings[ticket_id] = postings.get(ticket_id, 0) + count * weight
+        
+        added = sum(terms.values()) * weight
+        self.lengths[ticket_id] = self.lengths.get(ticket_id, 0) + added
+        self.total_length += added
+    
+    def search(self, query: str, allowed, limit: int = SEARCH_RESULTS) -> List[tuple]:
+        """The best ``(ticket_id, score)`` matches for which ``allowed(ticket_id)`` holds"""
+        if not self.lengths:
+            return []
+        
+        count = len(self.lengths)
+        average_length = self.total_length / count
+        scores = collections.defaultdict(float)
+        for term in set(self.tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for ticket_id, frequency in postings.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[ticket_id] / average_length)
+                scores[ticket_id] += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+        
+        results = []
+        for ticket_id in sorted(scores, key=scores.__getitem__, reverse=True):
+            if allowed(ticket_id):
+                results.append((ticket_id, scores[ticket_id]))
+                if len(results) == limit:
+                    break
+        return results
+
+SEARCH_INDEX = SearchIndex()
+
+def index_ticket(ticket: Ticket):
+    SEARCH_INDEX.add(ticket.id, ticket.title, SEARCH_TITLE_WEIGHT)
+    SEARCH_INDEX.add(ticket.id, ticket.description)
+
+def restore_saved_tickets():
+    """Bring snapshotted tickets back once their members are cached, re-arming their notices"""
+    pending = []
+    for data in SAVED_TICKETS:
+        guild = bot.get_guild(data["guild"])
+        ticket = guild and Ticket.from_snapshot(data, guild)
+        if not ticket:
+            pending.append(data)
+            continue
+        
+        TICKETS_DB[ticket.id] = ticket
+        index_ticket(ticket)
+        for (content,) in db.execute("SELECT content FROM ticket_comments WHERE ticket_id = ?", (ticket.id,)):
+            SEARCH_INDEX.add(ticket.id, content)
+        
+        if ticket.status in CLOSED_STATUSES:
+            continue
+        # Notices due before the snapshot were already sent; ones that fell during the restart go out now
+        if ticket.deadline_at > data["saved_at"]:
+            index_ticket_deadline(ticket)
+        close_at = ticket.last_activity + INACTIVITY_CLOSE_AFTER
+        INACTIVITY_INDEX.schedule(ticket.id, close_at if ticket.inactivity_warned else close_at - INACTIVITY_WARNING)
+    SAVED_TICKETS[:] = pending
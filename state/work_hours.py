@@ -0,0 +1,198 @@
+"""Work-hour state: logged hours, online-time accrual and voice sessions"""
+import asyncio
+import time
+from typing import Optional
+
+import discord
+import numpy as np
+
+from core import apply_rewards, bot, count_activity, db, queue_reward, snapshot
+
+# Logged work hours
+WORK_HOURS = snapshot("work_hours", {})
+
+# Activity accrual
+ACTIVE_HOUR_COINS = 1
+ACTIVE_HOUR_XP = 10
+ACTIVITY_CREDIT_BATCH = 2000  # Awards credited between yields to the event loop
+
+class ActivityLedger:
+    """Online-time accrual for every member, kept in NumPy columns.
+
+    Each member gets a dense slot on first sight. Presence changes only
+    touch that slot, and ``settle`` turns accumulated time into whole-hour
+    awards for all members with a few vectorized operations, returning
+    awards only for the rows that earned something, in batches.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.slots = {}  # user_id -> slot
+        self.user_ids = []  # slot -> user_id
+        self.active = np.zeros(capacity, dtype=bool)
+        self.last_active = np.zeros(capacity, dtype=np.float64)  # Epoch seconds accrual last ran to
+        self.accumulated = np.zeros(capacity, dtype=np.float64)  # Seconds not yet paid out
+        self.coins = np.zeros(capacity, dtype=np.float64)  # Lifetime coins from activity, before multipliers
+        self.xp = np.zeros(capacity, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def slot(self, user_id: str) -> int:
+        slot = self.slots.get(user_id)
+        if slot is None:
+            slot = len(self.user_ids)
+            if slot == len(self.active):
+                self._grow()
+            self.slots[user_id] = slot
+            self.user_ids.append(user_id)
+        return slot
+
+    def _grow(self):
+        for column in ("active", "last_active", "accumulated", "coins", "xp"):
+            array = getattr(self, column)
+            grown = np.zeros(len(array) * 2, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, column, grown)
+
+    def set_active(self, user_id: str, active: bool, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        slot = self.slot(user_id)
+        if active and not self.active[slot]:
+            self.last_active[slot] = now
+        elif not active and self.active[slot]:
+            self.accumulated[slot] += now - self.last_active[slot]
+        self.active[slot] = active
+
+    def settle(self, now: Optional[float] = None, batch_size: int = ACTIVITY_CREDIT_BATCH):
+        """Accrue time up to now, returning batches of ``(user_id, coins, xp)`` for full hours earned.
+
+        The accrual happens immediately; the award tuples are only built
+        as each batch is taken.
+        """
+        now = time.time() if now is None else now
+        n = len(self.user_ids)
+        active = self.active[:n]
+        last_active = self.last_active[:n]
+        accumulated = self.accumulated[:n]
+        
+        # Branch-free: inactive rows add zero, and their last_active is
+        # overwritten by set_active before it is ever read again
+        elapsed = now - last_active
+        elapsed *= active
+        accumulated += elapsed
+        last_active.fill(now)
+        
+        changed = np.flatnonzero(accumulated >= 3600)
+        hours = (accumulated[changed] // 3600).astype(np.int64)
+        accumulated[changed] -= hours * 3600
+        coins = hours * ACTIVE_HOUR_COINS
+        xp = hours * ACTIVE_HOUR_XP
+        self.coins[changed] += coins
+        self.xp[changed] += xp
+        return self._batches(changed, coins, xp, batch_size)
+
+    def _batches(self, slots, coins, xp, batch_size: int):
+        user_ids = self.user_ids
+        for start in range(0, len(slots), batch_size):
+            end = start + batch_size
+            yield [
+                (user_ids[slot], c, x)
+                for slot, c, x in zip(slots[start:end].tolist(), coins[start:end].tolist(), xp[start:end].tolist())
+            ]
+
+ACTIVITY = ActivityLedger()
+
+async def credit_activity():
+    """Settle ACTIVITY and credit it a batch at a time, so a wave of members crossing an hour doesn't stall the bot"""
+    for awards in ACTIVITY.settle():
+        apply_rewards(awards)
+        await asyncio.sleep(0)
+
+# Voice time tracking
+VOICE_XP_PER_MINUTE = 1
+VOICE_SESSIONS = {}  # Format: {user_id: (channel_id, guild_id, joined_at epoch)} for members in voice right now
+
+db.execute("""CREATE TABLE IF NOT EXISTS voice_intervals (
+    user_id TEXT, channel_id INTEGER, guild_id INTEGER, joined_at REAL, left_at REAL
+)""")
+db.execute("""CREATE TABLE IF NOT EXISTS voice_open (
+    user_id TEXT PRIMARY KEY, channel_id INTEGER, guild_id INTEGER, joined_at REAL
+)""")
+db.execute("CREATE TABLE IF NOT EXISTS voice_totals (user_id TEXT PRIMARY KEY, seconds REAL NOT NULL DEFAULT 0)")
+db.execute("CREATE INDEX IF NOT EXISTS voice_totals_by_seconds ON voice_totals (seconds DESC)")
+db.commit()
+
+def open_voice_session(user_id: str, channel: discord.abc.GuildChannel, joined_at: float):
+    VOICE_SESSIONS[user_id] = (channel.id, channel.guild.id, joined_at)
+    with db:
+        db.execute(
+            "INSERT OR REPLACE INTO voice_open (user_id, channel_id, guild_id, joined_at) VALUES (?, ?, ?, ?)",
+            (user_id, channel.id, channel.guild.id, joined_at)
+        )
+
+def close_voice_session(user_id: str, left_at: float):
+    """Log the finished interval and fold it into the running totals, salary and XP"""
+    session = VOICE_SESSIONS.pop(user_id, None)
+    if not session:
+        return
+    
+    channel_id, guild_id, joined_at = session
+    seconds = max(0, left_at - joined_at)
+    with db:
+        db.execute("DELETE FROM voice_open WHERE user_id = ?", (user_id,))
+        db.execute(
+            "INSERT INTO voice_intervals (user_id, channel_id, guild_id, joined_at, left_at) VALUES (?, ?, ?, ?, ?)",
+            (user_id, channel_id, guild_id, joined_at, left_at)
+        )
+        db.execute(
+            """INSERT INTO voice_totals (user_id, seconds) VALUES (?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET seconds = seconds + excluded.seconds""",
+            (user_id, seconds)
+        )
+    
+    count_activity(user_id, "voice_seconds", seconds)
+    queue_reward(user_id, xp=seconds / 60 * VOICE_XP_PER_MINUTE)
+
+def voice_seconds(user_id: str) -> float:
+    """Lifetime voice time, including the session in progress"""
+    row = db.execute("SELECT seconds FROM voice_totals WHERE user_id = ?", (user_id,)).fetchone()
+    total = row[0] if row else 0
+    session = VOICE_SESSIONS.get(user_id)
+    if session:
+        total += time.time() - session[2]
+    return total
+
+def is_tracked_voice_channel(channel: Optional[discord.abc.GuildChannel]) -> bool:
+    return channel is not None and channel != channel.guild.afk_channel
+
+def reconcile_voice_sessions():
+    """Rebuild VOICE_SESSIONS after a restart from the live voice states.
+    
+    Sessions still open in the database are kept if the member is still
+    in that channel, and otherwise closed at the last heartbeat before
+    the restart. Members found in voice without a session get a new one.
+    """
+    now = time.time()
+    row = db.execute("SELECT value FROM bot_meta WHERE key = 'heartbeat'").fetchone()
+    last_seen = min(float(row[0]), now) if row else now
+    
+    in_voice = {}
+    for guild in bot.guilds:
+        for channel in guild.voice_channels + guild.stage_channels:
+            if not is_tracked_voice_channel(channel):
+                continue
+            for member_id in channel.voice_states:
+                member = guild.get_member(member_id)
+                if member and not member.bot:
+                    in_voice[str(member_id)] = channel
+    
+    for user_id, channel_id, guild_id, joined_at in db.execute("SELECT * FROM voice_open").fetchall():
+        VOICE_SESSIONS[user_id] = (channel_id, guild_id, joined_at)
+        channel = in_voice.get(user_id)
+        if channel and channel.id == channel_id:
+            del in_voice[user_id]
+        else:
+            close_voice_session(user_id, max(joined_at, last_seen))
+    
+    for user_id, channel in in_voice.items():
+        open_voice_session(user_id, channel, now)